@@ -0,0 +1,239 @@
+from __future__ import annotations
+import argparse
+from dataclasses import dataclass, asdict
+import hashlib
+import json
+import random
+import sys
+import time
+import tracemalloc
+from colecao_tad import Colecao, BACKENDS
+
+# Proporção de cada operação (insere, remove, troca) em cada tipo de carga.
+CARGAS = {
+    'insercao': (0.85, 0.10, 0.05),
+    'remocao': (0.30, 0.65, 0.05),
+    'troca': (0.60, 0.10, 0.30),
+}
+
+# Uma operação da carga: ('insere' | 'remove', lado, figurinha) ou ('troca', 0, 0). O lado (0 ou 1)
+# indica em qual das duas coleções a operação é feita; a troca é sempre da coleção 0 com a 1.
+Operacao = tuple[str, int, int]
+
+
+@dataclass
+class Resultado:
+    '''
+    Resultado da execução de uma carga em uma representação. A *assinatura* resume as saídas
+    (visualizar, repetidas e os erros de cada operação) e deve ser igual em todas as representações.
+    '''
+    backend: str
+    carga: str
+    tam_album: int
+    operacoes: int
+    segundos: float
+    ops_por_segundo: float
+    pico_memoria: int | None
+    assinatura: str
+
+
+
+def gera_carga(tipo: str, tam_album: int, n: int, semente: int = 0) -> list[Operacao]:
+    '''
+    Gera uma carga aleatória de *n* operações do *tipo* (uma das chaves de CARGAS) sobre um álbum
+    de *tam_album* figurinhas. A carga depende apenas dos parâmetros, de modo que todas as
+    representações recebem exatamente as mesmas operações.
+
+    As remoções escolhem, na maior parte das vezes, uma figurinha já inserida no mesmo lado, e as
+    inserções repetem figurinhas com frequência, para que haja repetidas a trocar.
+
+    Exemplos:
+    >>> gera_carga('troca', 100, 5, semente=1) == gera_carga('troca', 100, 5, semente=1)
+    True
+    >>> len(gera_carga('insercao', 10, 50))
+    50
+    >>> sorted({op for op, _, _ in gera_carga('remocao', 10, 200)})
+    ['insere', 'remove', 'troca']
+    '''
+    p_insere, p_remove, _ = CARGAS[tipo]
+    rnd = random.Random(semente)
+    inseridas: tuple[list[int], list[int]] = ([], [])
+    carga: list[Operacao] = []
+    for _ in range(n):
+        sorteio = rnd.random()
+        lado = rnd.randrange(2)
+        if sorteio < p_insere:
+            if inseridas[lado] and rnd.random() < 0.3:
+                fig = rnd.choice(inseridas[lado])
+            else:
+                fig = rnd.randint(1, tam_album)
+            inseridas[lado].append(fig)
+            carga.append(('insere', lado, fig))
+        elif sorteio < p_insere + p_remove:
+            if inseridas[lado] and rnd.random() < 0.9:
+                fig = inseridas[lado].pop(rnd.randrange(len(inseridas[lado])))
+            else:
+                fig = rnd.randint(0, tam_album + 1)
+            carga.append(('remove', lado, fig))
+        else:
+            carga.append(('troca', 0, 0))
+    return carga
+
+
+
+def executa(backend: str, tipo: str, tam_album: int, carga: list[Operacao], memoria: bool = False) -> Resultado:
+    '''
+    Executa a *carga* (do *tipo* dado) sobre duas coleções vazias da representação *backend* e
+    retorna o tempo gasto e a assinatura das saídas. Apenas as operações da carga são cronometradas;
+    a assinatura é calculada depois. Se *memoria* é True, a carga é executada uma segunda vez com
+    tracemalloc para medir o pico de memória (a medição não afeta o tempo).
+
+    Exemplos:
+    >>> carga = gera_carga('troca', 50, 300, semente=7)
+    >>> r1 = executa('arranjo', 'troca', 50, carga)
+    >>> r2 = executa('bitset', 'troca', 50, carga, memoria=True)
+    >>> r1.assinatura == r2.assinatura, r2.pico_memoria > 0
+    (True, True)
+    '''
+    inicio = time.perf_counter()
+    cols, erros = _aplica(backend, tam_album, carga)
+    segundos = time.perf_counter() - inicio
+    assinatura = _assinatura(cols, erros)
+
+    pico = None
+    if memoria:
+        tracemalloc.start()
+        _aplica(backend, tam_album, carga)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    ops = len(carga) / segundos if segundos > 0 else float('inf')
+    return Resultado(backend, tipo, tam_album, len(carga), segundos, ops, pico, assinatura)
+
+
+
+def conformidade(resultados: list[Resultado]) -> list[Resultado]:
+    '''
+    Retorna os resultados cuja assinatura diverge da primeira representação executada com a mesma
+    carga e o mesmo tamanho de álbum (lista vazia se todas as representações concordam).
+
+    Exemplos:
+    >>> r = Resultado('arranjo', 'troca', 10, 0, 0.0, 0.0, None, 'a')
+    >>> conformidade([r, Resultado('no', 'troca', 10, 0, 0.0, 0.0, None, 'a')])
+    []
+    >>> [d.backend for d in conformidade([r, Resultado('no', 'troca', 10, 0, 0.0, 0.0, None, 'b')])]
+    ['no']
+    '''
+    referencia: dict[tuple[str, int], str] = {}
+    divergentes = []
+    for r in resultados:
+        esperada = referencia.setdefault((r.carga, r.tam_album), r.assinatura)
+        if r.assinatura != esperada:
+            divergentes.append(r)
+    return divergentes
+
+
+
+def bateria(backends: list[str], tipos: list[str], tamanhos: list[int], n: int,
+            semente: int = 0, memoria: bool = False) -> list[Resultado]:
+    '''
+    Executa cada carga de *tipos* com cada tamanho de álbum de *tamanhos* em todas as *backends*,
+    com a mesma carga para todas as representações. Os resultados de um mesmo tipo de carga e
+    representação, em ordem de tamanho, formam a curva de escala da representação.
+
+    Exemplos:
+    >>> rs = bateria(list(BACKENDS), ['insercao', 'troca'], [10, 1000], 200)
+    >>> len(rs), conformidade(rs)
+    (16, [])
+    '''
+    resultados = []
+    for tipo in tipos:
+        for tam in tamanhos:
+            carga = gera_carga(tipo, tam, n, semente)
+            for backend in backends:
+                resultados.append(executa(backend, tipo, tam, carga, memoria))
+    return resultados
+
+
+
+def relatorio(resultados: list[Resultado]) -> str:
+    '''
+    Retorna o relatório JSON dos *resultados*, com as medições e as divergências encontradas.
+
+    Exemplos:
+    >>> rs = bateria(['arranjo', 'esparsa'], ['remocao'], [100], 50)
+    >>> dados = json.loads(relatorio(rs))
+    >>> [r['backend'] for r in dados['resultados']], dados['divergentes']
+    (['arranjo', 'esparsa'], [])
+    '''
+    return json.dumps({
+        'resultados': [asdict(r) for r in resultados],
+        'divergentes': [asdict(r) for r in conformidade(resultados)],
+    }, indent=2)
+
+
+
+def _aplica(backend: str, tam_album: int, carga: list[Operacao]) -> tuple[tuple[Colecao, Colecao], list[tuple[int, ValueError]]]:
+    '''
+    Aplica a *carga* a duas coleções novas da representação *backend* e retorna as coleções e os
+    erros de cada operação (índice da operação e exceção), para *_assinatura*.
+    '''
+    cols = (Colecao.create(tam_album, backend=backend), Colecao.create(tam_album, backend=backend))
+    erros = []
+    for i, (op, lado, fig) in enumerate(carga):
+        try:
+            if op == 'insere':
+                cols[lado].insere(fig)
+            elif op == 'remove':
+                cols[lado].remove(fig)
+            else:
+                cols[0].troca(cols[1])
+        except ValueError as e:
+            erros.append((i, e))
+    return cols, erros
+
+
+
+def _assinatura(cols: tuple[Colecao, Colecao], erros: list[tuple[int, ValueError]]) -> str:
+    '''
+    Retorna a assinatura das saídas de *_aplica*: os erros das operações e o estado final
+    (visualizar e repetidas) das coleções.
+    '''
+    h = hashlib.sha256()
+    for i, e in erros:
+        h.update(f'{i}:{e};'.encode())
+    saida = hashlib.sha256(h.digest())
+    for c in cols:
+        saida.update(c.visualizar().encode())
+        saida.update(c.repetidas().encode())
+    return saida.hexdigest()
+
+
+
+def main(argv: list[str] | None = None) -> int:
+    '''
+    Executa a bateria pela linha de comando e escreve o relatório JSON. Retorna 1 se alguma
+    representação diverge das demais.
+    '''
+    parser = argparse.ArgumentParser(description='Compara as representações de Colecao.')
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument('--cargas', nargs='+', default=list(CARGAS), choices=list(CARGAS))
+    parser.add_argument('--tamanhos', nargs='+', type=int, default=[10**3, 10**4, 10**5])
+    parser.add_argument('--operacoes', type=int, default=10_000)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--memoria', action='store_true', help='mede o pico de memória com tracemalloc')
+    parser.add_argument('--saida', default='-', help="arquivo do relatório ('-' para a saída padrão)")
+    args = parser.parse_args(argv)
+
+    resultados = bateria(args.backends, args.cargas, args.tamanhos, args.operacoes, args.semente, args.memoria)
+    texto = relatorio(resultados)
+    if args.saida == '-':
+        print(texto)
+    else:
+        with open(args.saida, 'w') as arquivo:
+            arquivo.write(texto)
+    return 1 if conformidade(resultados) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,287 @@
+from __future__ import annotations
+import mmap
+from typing import BinaryIO, Iterable, Iterator
+
+# Formato do instantâneo (snapshot) de uma coleção:
+#   MAGICO | versão (1 byte) | tam_album | distintas | tamanho do corpo | corpo
+# Os três campos após a versão são varints (7 bits por byte, o bit mais alto indica
+# continuação). O corpo tem, para cada figurinha em ordem crescente, a diferença para a
+# figurinha anterior e a quantidade menos 1, também em varint. Vários instantâneos podem
+# ser gravados em sequência no mesmo arquivo.
+MAGICO = b'FIG'
+VERSAO = 1
+
+
+def escreve_varint(saida: bytearray, n: int) -> None:
+    '''
+    Acrescenta a *saida* o inteiro não negativo *n* codificado como varint.
+
+    Exemplos:
+    >>> b = bytearray()
+    >>> escreve_varint(b, 5)
+    >>> escreve_varint(b, 300)
+    >>> b.hex()
+    '05ac02'
+    '''
+    while n >= 0x80:
+        saida.append((n & 0x7f) | 0x80)
+        n >>= 7
+    saida.append(n)
+
+
+
+def le_varint(buf: bytes | mmap.mmap, pos: int) -> tuple[int, int]:
+    '''
+    Lê um varint de *buf* a partir de *pos*, retornando o valor e a posição seguinte.
+
+    Exemplos:
+    >>> le_varint(bytes.fromhex('05ac02'), 1)
+    (300, 3)
+    >>> le_varint(b'\\x80', 0)
+    Traceback (most recent call last):
+    ...
+    ValueError: instantâneo incompleto
+    '''
+    n = 0
+    desloc = 0
+    while True:
+        if pos >= len(buf):
+            raise ValueError('instantâneo incompleto')
+        b = buf[pos]
+        pos += 1
+        n |= (b & 0x7f) << desloc
+        if b < 0x80:
+            return n, pos
+        desloc += 7
+
+
+
+def codifica(tam_album: int, quantidades: Iterable[tuple[int, int]]) -> bytes:
+    '''
+    Retorna o instantâneo de uma coleção de um álbum de *tam_album* figurinhas com os pares
+    (figurinha, quantidade) de *quantidades*, em ordem crescente de figurinha.
+
+    Exemplos:
+    >>> codifica(1000, [(3, 1), (4, 2), (900, 1)]).hex()
+    '46494701e807030703000101800700'
+    '''
+    corpo = bytearray()
+    anterior = 0
+    distintas = 0
+    for fig, qtd in quantidades:
+        escreve_varint(corpo, fig - anterior)
+        escreve_varint(corpo, qtd - 1)
+        anterior = fig
+        distintas += 1
+
+    saida = bytearray(MAGICO)
+    saida.append(VERSAO)
+    escreve_varint(saida, tam_album)
+    escreve_varint(saida, distintas)
+    escreve_varint(saida, len(corpo))
+    return bytes(saida + corpo)
+
+
+
+def le_cabecalho(fp: BinaryIO) -> tuple[int, int, int]:
+    '''
+    Lê de *fp* o cabeçalho de um instantâneo, retornando (tam_album, distintas, tamanho do corpo).
+    O arquivo fica posicionado no início do corpo.
+    '''
+    if fp.read(len(MAGICO)) != MAGICO:
+        raise ValueError('arquivo não é um instantâneo de coleção')
+    versao = fp.read(1)
+    if versao != bytes([VERSAO]):
+        raise ValueError(f'versão de instantâneo não suportada: {versao!r}')
+    campos = []
+    for _ in range(3):
+        # lê os bytes do varint (até o último, sem o bit de continuação) e o decodifica com le_varint
+        buf = bytearray()
+        while True:
+            b = fp.read(1)
+            buf += b
+            if not b or b[0] < 0x80:
+                break
+        campos.append(le_varint(buf, 0)[0])
+    return campos[0], campos[1], campos[2]
+
+
+
+def decodifica(buf: bytes | mmap.mmap, inicio: int, fim: int, tam_album: int) -> Iterator[tuple[int, int]]:
+    '''
+    Itera sobre os pares (figurinha, quantidade) do corpo de um instantâneo em buf[inicio:fim],
+    de um álbum de *tam_album* figurinhas. Um corpo com figurinhas fora de ordem, repetidas ou
+    fora do álbum é rejeitado.
+
+    Exemplos:
+    >>> list(decodifica(bytes.fromhex('03000101800700'), 0, 7, 1000))
+    [(3, 1), (4, 2), (900, 1)]
+    >>> list(decodifica(bytes.fromhex('03000000'), 0, 4, 1000))
+    Traceback (most recent call last):
+    ...
+    ValueError: instantâneo inválido
+    >>> list(decodifica(bytes.fromhex('03000101800700'), 0, 7, 10))
+    Traceback (most recent call last):
+    ...
+    ValueError: instantâneo inválido
+    '''
+    fig = 0
+    pos = inicio
+    while pos < fim:
+        delta, pos = le_varint(buf, pos)
+        qtd, pos = le_varint(buf, pos)
+        fig += delta
+        if delta < 1 or fig > tam_album:
+            raise ValueError('instantâneo inválido')
+        yield fig, qtd + 1
+
+
+
+class Instantaneo:
+    '''
+    Acesso somente leitura a um instantâneo gravado em um buffer (por exemplo, um arquivo
+    mapeado em memória por *abre_instantaneos*), sem carregá-lo em uma coleção.
+
+    Exemplos:
+    >>> inst = Instantaneo(codifica(10, [(2, 3), (7, 1)]) + codifica(5, []))
+    >>> inst.tam_album, inst.distintas, inst.quantidade(2), inst.quantidade(3)
+    (10, 2, 3, 0)
+    >>> inst.visualizar(), inst.repetidas()
+    ('[2, 7]', '[2 (2)]')
+    >>> Instantaneo(inst.buf, inst.fim).tam_album
+    5
+    >>> Instantaneo(inst.buf[:3])
+    Traceback (most recent call last):
+    ...
+    ValueError: instantâneo incompleto
+    '''
+
+    buf: bytes | mmap.mmap
+    tam_album: int
+    distintas: int
+    inicio: int
+    fim: int
+
+    def __init__(self, buf: bytes | mmap.mmap, pos: int = 0) -> None:
+        '''
+        Lê o cabeçalho do instantâneo que começa em *pos* de *buf*. O próximo instantâneo
+        do buffer, se houver, começa em *fim*.
+        '''
+        if buf[pos:pos + len(MAGICO)] != MAGICO:
+            raise ValueError('arquivo não é um instantâneo de coleção')
+        pos += len(MAGICO)
+        if pos >= len(buf):
+            raise ValueError('instantâneo incompleto')
+        if buf[pos] != VERSAO:
+            raise ValueError(f'versão de instantâneo não suportada: {buf[pos]}')
+        self.buf = buf
+        self.tam_album, pos = le_varint(buf, pos + 1)
+        self.distintas, pos = le_varint(buf, pos)
+        tamanho, self.inicio = le_varint(buf, pos)
+        self.fim = self.inicio + tamanho
+        if self.fim > len(buf):
+            raise ValueError('instantâneo incompleto')
+
+    def itera_quantidades(self) -> Iterator[tuple[int, int]]:
+        '''
+        Itera, em ordem crescente, sobre os pares (figurinha, quantidade).
+        '''
+        return decodifica(self.buf, self.inicio, self.fim, self.tam_album)
+
+    def quantidade(self, fig: int) -> int:
+        '''
+        Retorna a quantidade de cópias de *fig* (0 se ela não está no instantâneo).
+        '''
+        for f, qtd in self.itera_quantidades():
+            if f >= fig:
+                return qtd if f == fig else 0
+        return 0
+
+    def visualizar(self) -> str:
+        '''
+        Retorna a mesma string que *visualizar* da coleção gravada.
+        '''
+        return '[' + ', '.join(str(fig) for fig, _ in self.itera_quantidades()) + ']'
+
+    def repetidas(self) -> str:
+        '''
+        Retorna a mesma string que *repetidas* da coleção gravada.
+        '''
+        return '[' + ', '.join(f'{fig} ({qtd - 1})' for fig, qtd in self.itera_quantidades() if qtd > 1) + ']'
+
+
+
+class ArquivoInstantaneos:
+    '''
+    Os instantâneos de um arquivo mapeado em memória por *abre_instantaneos*, acessados como uma
+    sequência de *Instantaneo*. O mapeamento é liberado por *close* (ou ao fim de um bloco *with*),
+    depois do que os instantâneos não podem mais ser lidos.
+    '''
+
+    instantaneos: list[Instantaneo]
+
+    def __init__(self, buf: mmap.mmap | None) -> None:
+        '''
+        Lê os cabeçalhos dos instantâneos gravados em sequência em *buf* (None para um arquivo vazio).
+        '''
+        self.instantaneos = []
+        self.__buf = buf
+        pos = 0
+        try:
+            while buf is not None and pos < len(buf):
+                inst = Instantaneo(buf, pos)
+                self.instantaneos.append(inst)
+                pos = inst.fim
+        except ValueError:
+            self.close()
+            raise
+
+    def __len__(self) -> int:
+        return len(self.instantaneos)
+
+    def __getitem__(self, i: int) -> Instantaneo:
+        return self.instantaneos[i]
+
+    def __iter__(self) -> Iterator[Instantaneo]:
+        return iter(self.instantaneos)
+
+    def close(self) -> None:
+        '''
+        Libera o mapeamento do arquivo.
+        '''
+        if self.__buf is not None:
+            self.__buf.close()
+            self.__buf = None
+
+    def __enter__(self) -> ArquivoInstantaneos:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+
+def abre_instantaneos(caminho: str) -> ArquivoInstantaneos:
+    '''
+    Mapeia em memória (somente leitura) o arquivo *caminho*, com instantâneos gravados em
+    sequência, e retorna os instantâneos (um *Instantaneo* para cada um), sem decodificar os
+    corpos. Use *close* (ou um bloco *with*) para liberar o mapeamento.
+
+    Exemplos:
+    >>> import os, tempfile
+    >>> caminho = os.path.join(tempfile.mkdtemp(), 'colecoes.bin')
+    >>> with open(caminho, 'wb') as fp:
+    ...     _ = fp.write(codifica(10, [(1, 2)]) + codifica(10, [(4, 1), (5, 1)]))
+    >>> with abre_instantaneos(caminho) as arquivo:
+    ...     len(arquivo), [i.visualizar() for i in arquivo]
+    (2, ['[1]', '[4, 5]'])
+    >>> arquivo[0].visualizar()
+    Traceback (most recent call last):
+    ...
+    ValueError: mmap closed or invalid
+    '''
+    with open(caminho, 'rb') as fp:
+        if fp.seek(0, 2) == 0:
+            return ArquivoInstantaneos(None)
+        buf = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+    return ArquivoInstantaneos(buf)
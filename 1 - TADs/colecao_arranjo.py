@@ -1,8 +1,13 @@
 from __future__ import annotations
-from ed import array
+from typing import Iterable, Iterator, TextIO
+import io
+from collections import Counter
+from ed import array, bitset
+from colecao_saida import escreve_listagem
+from colecao_tad import Colecao as ColecaoTAD, RelatorioTroca
 
 
-class Colecao:
+class Colecao(ColecaoTAD):
     '''
     Uma classe que representa uma coleção de figurinhas, com métodos para adicionar e remover figurinhas,
     vizualizar a coleção e realizar a troca entre a quantidade máxima possível entre dois colecionadores.
@@ -65,10 +70,14 @@ class Colecao:
     '''
 
     figurinhas: array[int]
+    tam_album: int
+    n_distintas: int
+    n_repetidas: int
 
     def __init__(self, tam_album: int) -> None:
         '''
         Construtor da classe 'Colecao', que inicializa a coleção vazia.
+        As quantidades são guardadas em um arranjo tipado (4 bytes por figurinha).
 
         Exemplos:
         >>> c = Colecao(100)
@@ -78,7 +87,10 @@ class Colecao:
         '[]'
         '''
 
-        self.figurinhas = array(tam_album, 0)
+        self.figurinhas = array(tam_album, 0, typecode='i')
+        self.tam_album = tam_album
+        self.n_distintas = 0
+        self.n_repetidas = 0
 
 
 
@@ -115,6 +127,10 @@ class Colecao:
         if fig > len(self.figurinhas) or fig < 1:
             raise ValueError('Figurinha não existe')
 
+        if self.figurinhas[fig - 1] == 0:
+            self.n_distintas += 1
+        else:
+            self.n_repetidas += 1
         self.figurinhas[fig - 1] += 1
 
 
@@ -165,10 +181,83 @@ class Colecao:
         elif self.figurinhas[fig - 1] < 1:
             raise ValueError('figurinha não está na coleção (quantidade < 1)')
 
+        if self.figurinhas[fig - 1] == 1:
+            self.n_distintas -= 1
+        else:
+            self.n_repetidas -= 1
         self.figurinhas[fig - 1] -= 1
 
 
 
+    def insere_muitos(self, figs: Iterable[int]) -> None:
+        '''
+        Insere todas as figurinhas de *figs* na coleção, como chamadas sucessivas de *insere*, mas
+        validando o lote inteiro antes de alterar a coleção e aplicando-o de uma só vez.
+
+        Exemplos:
+        >>> c = Colecao(100)
+        >>> c.insere(5)
+        >>> c.insere_muitos([7, 1, 5, 7, 7])
+        >>> c.visualizar()
+        '[1, 5, 7]'
+        >>> c.repetidas()
+        '[5 (1), 7 (2)]'
+        >>> c.insere_muitos([2, 101])
+        Traceback (most recent call last):
+        ...
+        ValueError: Figurinha não existe
+        >>> c.visualizar()
+        '[1, 5, 7]'
+        '''
+        lote = Counter(figs)
+        if lote and (min(lote) < 1 or max(lote) > len(self.figurinhas)):
+            raise ValueError('Figurinha não existe')
+
+        for fig, qtd in lote.items():
+            nova = self.figurinhas[fig - 1] == 0
+            self.n_distintas += nova
+            self.n_repetidas += qtd - nova
+            self.figurinhas[fig - 1] += qtd
+
+
+
+    def remove_muitos(self, figs: Iterable[int]) -> None:
+        '''
+        Remove todas as figurinhas de *figs* da coleção, como chamadas sucessivas de *remove*, mas
+        validando o lote inteiro antes de alterar a coleção e aplicando-o de uma só vez.
+
+        Exemplos:
+        >>> c = Colecao(100)
+        >>> c.insere_muitos([1, 2, 2, 3, 3, 3])
+        >>> c.remove_muitos([3, 2, 3])
+        >>> c.visualizar()
+        '[1, 2, 3]'
+        >>> c.remove_muitos([1, 1])
+        Traceback (most recent call last):
+        ...
+        ValueError: figurinha não está na coleção (quantidade < 1)
+        >>> c.remove_muitos([0])
+        Traceback (most recent call last):
+        ...
+        ValueError: figurinha não faz parte do álbum (não existe)
+        >>> c.visualizar()
+        '[1, 2, 3]'
+        '''
+        lote = Counter(figs)
+        if lote and (min(lote) < 1 or max(lote) > len(self.figurinhas)):
+            raise ValueError('figurinha não faz parte do álbum (não existe)')
+        for fig, qtd in lote.items():
+            if self.figurinhas[fig - 1] < qtd:
+                raise ValueError('figurinha não está na coleção (quantidade < 1)')
+
+        for fig, qtd in lote.items():
+            ultima = self.figurinhas[fig - 1] == qtd
+            self.n_distintas -= ultima
+            self.n_repetidas -= qtd - ultima
+            self.figurinhas[fig - 1] -= qtd
+
+
+
     def visualizar(self) -> str:
         '''
         Retorna uma string que representa a coleção, sem repetições.
@@ -188,17 +277,9 @@ class Colecao:
         '[2, 4]'
         '''
 
-        x = '['
-        for i in range(len(self.figurinhas)):
-            if self.figurinhas[i] > 0:
-                x += str(i + 1) + ', '
-
-        if x[-1] != '[' and x[-2] == ',': # Se a string não está vazia
-            x = x[:-2]
-
-        x += ']'
-
-        return x
+        arquivo = io.StringIO()
+        self.escreve_visualizacao(arquivo)
+        return arquivo.getvalue()
     
 
 
@@ -222,18 +303,131 @@ class Colecao:
         '[1 (1), 3 (1)]'
         '''
         
-        x = '['
-        for i in range(len(self.figurinhas)):
-            if self.figurinhas[i] > 1:
-                x += str(i + 1) + ' (' + str(self.figurinhas[i] - 1) + ')' + ', '
+        arquivo = io.StringIO()
+        self.escreve_repetidas(arquivo)
+        return arquivo.getvalue()
+    
 
-        if x[-1] != '[' and x[-2] == ',':
-            x = x[:-2]
 
-        x += ']'
+    def itera_possuidas(self) -> Iterator[int]:
+        '''
+        Itera, em ordem crescente e sem repetições, sobre as figurinhas da coleção.
+
+        Exemplos:
+        >>> c = Colecao(100)
+        >>> c.insere(4)
+        >>> c.insere(2)
+        >>> c.insere(4)
+        >>> list(c.itera_possuidas())
+        [2, 4]
+        '''
+        for i in self.figurinhas.nonzero():
+            yield i + 1
+
+
+
+    def itera_repetidas(self) -> Iterator[tuple[int, int]]:
+        '''
+        Itera, em ordem crescente, sobre os pares (figurinha, quantidade em excesso) das figurinhas
+        repetidas da coleção.
+
+        Exemplos:
+        >>> c = Colecao(100)
+        >>> c.insere(4)
+        >>> c.insere(2)
+        >>> c.insere(4)
+        >>> c.insere(4)
+        >>> list(c.itera_repetidas())
+        [(4, 2)]
+        '''
+        for i in self.figurinhas.mask('>', 1).nonzero():
+            yield i + 1, self.figurinhas[i] - 1
+
+
+
+    def escreve_visualizacao(self, arquivo: TextIO) -> None:
+        '''
+        Escreve em *arquivo* a representação da coleção retornada por *visualizar*, em blocos,
+        sem montar a string completa.
+
+        Exemplos:
+        >>> import sys
+        >>> c = Colecao(100)
+        >>> c.insere(3)
+        >>> c.insere(1)
+        >>> c.escreve_visualizacao(sys.stdout)
+        [1, 3]
+        '''
+        escreve_listagem(arquivo, map(str, self.itera_possuidas()))
+
+
+
+    def escreve_repetidas(self, arquivo: TextIO) -> None:
+        '''
+        Escreve em *arquivo* a representação das repetidas retornada por *repetidas*, em blocos,
+        sem montar a string completa.
+
+        Exemplos:
+        >>> import sys
+        >>> c = Colecao(100)
+        >>> c.insere(3)
+        >>> c.insere(3)
+        >>> c.escreve_repetidas(sys.stdout)
+        [3 (1)]
+        '''
+        escreve_listagem(arquivo, (f'{fig} ({qtd})' for fig, qtd in self.itera_repetidas()))
+
+
+
+    def conjunto_possuidas(self) -> bitset:
+        '''
+        Retorna o conjunto (bitset) das figurinhas que estão na coleção. O
+        elemento *fig* do conjunto corresponde à figurinha *fig*.
+
+        Exemplos:
+        >>> c = Colecao(100)
+        >>> c.insere(5)
+        >>> c.insere(5)
+        >>> c.insere(9)
+        >>> list(c.conjunto_possuidas())
+        [5, 9]
+        '''
+        return bitset.from_mask(self.figurinhas.mask('>', 0), offset=1)
+
+
+
+    def conjunto_repetidas(self) -> bitset:
+        '''
+        Retorna o conjunto (bitset) das figurinhas repetidas da coleção.
+
+        Exemplos:
+        #figurinhas que faltam em c1 e estão repetidas em c2.
+        >>> c1 = Colecao(100)
+        >>> c2 = Colecao(100)
+        >>> c1.insere(1)
+        >>> c2.insere(1)
+        >>> c2.insere(1)
+        >>> c2.insere(7)
+        >>> c2.insere(7)
+        >>> c2.insere(8)
+        >>> list(c2.conjunto_repetidas() - c1.conjunto_possuidas())
+        [7]
+        >>> (c2.conjunto_repetidas() & c1.conjunto_possuidas()).count()
+        1
+        '''
+        return bitset.from_mask(self.figurinhas.mask('>', 1), offset=1)
+
+
+
+    def _carrega(self, quantidades: Iterable[tuple[int, int]]) -> None:
+        '''
+        Carrega os pares (figurinha, quantidade) diretamente no arranjo (usado por *convert*).
+        '''
+        for fig, qtd in quantidades:
+            self.figurinhas[fig - 1] = qtd
+            self.n_distintas += 1
+            self.n_repetidas += qtd - 1
 
-        return x
-    
 
 
     def troca(self, col: Colecao) -> None:
@@ -386,26 +580,68 @@ class Colecao:
         '[4, 5, 10]'
         '''
 
-        if len(self.figurinhas) != len(col.figurinhas):
+        self.troca_maxima(col)
+
+
+
+    def troca_maxima(self, col: Colecao, simular: bool = False) -> RelatorioTroca:
+        '''
+        Calcula e realiza a mesma troca de *troca*, retornando um relatório com os pares trocados
+        (figurinha recebida por self, figurinha recebida por col). Cada arranjo de quantidades é
+        percorrido uma única vez para encontrar suas repetidas, das quais ficam as que faltam na
+        outra coleção, de modo que só são criadas listas do tamanho das repetidas. As trocas são
+        aplicadas diretamente nos arranjos. Se *simular* é True, as coleções não são alteradas.
+
+        Exemplos:
+        >>> c1 = Colecao(100)
+        >>> c2 = Colecao(100)
+        >>> for fig in [1, 2, 4, 4, 6, 6]:
+        ...     c1.insere(fig)
+        >>> for fig in [5, 5, 10, 10, 10]:
+        ...     c2.insere(fig)
+        >>> c1.troca_maxima(c2, simular=True)
+        RelatorioTroca(pares=[(5, 4), (10, 6)])
+        >>> c1.visualizar()
+        '[1, 2, 4, 6]'
+        >>> r = c1.troca_maxima(c2)
+        >>> r.quantidade()
+        2
+        >>> c1.visualizar(), c1.repetidas()
+        ('[1, 2, 4, 5, 6, 10]', '[]')
+        >>> c2.visualizar(), c2.repetidas()
+        ('[4, 5, 6, 10]', '[10 (1)]')
+
+        Com uma coleção de outra representação, a troca é feita por *_troca_generica*:
+        >>> from colecao_esparsa import Colecao as ColecaoEsparsa
+        >>> c3 = ColecaoEsparsa(100)
+        >>> c3.insere_muitos([7, 7])
+        >>> c2.troca_maxima(c3)
+        RelatorioTroca(pares=[(7, 10)])
+        >>> c2.visualizar(), c3.visualizar()
+        ('[4, 5, 6, 7, 10]', '[7, 10]')
+        '''
+        if not isinstance(col, Colecao):
+            return self._troca_generica(col, simular)
+        if self.tam_album != col.tam_album:
             raise ValueError('os álbuns não possuem o mesmo tamanho (diferentes)')
 
-        trocaveis1 = array(len(self.figurinhas), 0)  #figurinhas que o album1 (self) pode receber
-        trocaveis2 = array(len(self.figurinhas), 0)  #figurinhas que o album2 (col) pode receber
-        x,y = 0,0
-
-        for i in range(len(self.figurinhas)):
-            if self.figurinhas[i] == 0 and col.figurinhas[i] > 1: #album1 sem figurinha e album2 com figurinha repetida
-                trocaveis1[x] = i + 1
-                x += 1
-
-            elif self.figurinhas[i] > 1 and col.figurinhas[i] == 0: #album1 com figurinha repetida e album2 sem figurinha
-                trocaveis2[y] = i + 1
-                y += 1
-
-        index = 0
-        while trocaveis1[index] > 0 and trocaveis2[index] > 0 and index < len(trocaveis2):
-            self.remove(trocaveis2[index])
-            self.insere(trocaveis1[index])
-            col.remove(trocaveis1[index])
-            col.insere(trocaveis2[index])
-            index += 1
+        a = self.figurinhas.buffer()
+        b = col.figurinhas.buffer()
+        # figurinhas que o album1 (self) pode receber: faltam em self e são repetidas em col
+        trocaveis1 = [i for i in col.figurinhas.indices_where('>', 1) if a[i] == 0]
+        # figurinhas que o album2 (col) pode receber: são repetidas em self e faltam em col
+        trocaveis2 = [i for i in self.figurinhas.indices_where('>', 1) if b[i] == 0]
+
+        pares = list(zip(trocaveis1, trocaveis2))
+        if not simular:
+            for i1, i2 in pares:
+                a[i1] += 1
+                a[i2] -= 1
+                b[i1] -= 1
+                b[i2] += 1
+            # cada par dá a cada coleção uma figurinha nova em troca de uma repetida
+            for c in (self, col):
+                c.n_distintas += len(pares)
+                c.n_repetidas -= len(pares)
+
+        return RelatorioTroca([(i1 + 1, i2 + 1) for i1, i2 in pares])
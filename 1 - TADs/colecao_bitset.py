@@ -0,0 +1,639 @@
+from __future__ import annotations
+from collections import Counter
+from typing import Iterable, Iterator, TextIO
+import io
+from ed import bitset
+from colecao_saida import escreve_listagem
+from colecao_tad import Colecao as ColecaoTAD
+
+
+class Colecao(ColecaoTAD):
+    '''
+    Uma classe que representa uma coleção de figurinhas, com métodos para adicionar e remover figurinhas,
+    vizualizar a coleção e realizar a troca entre a quantidade máxima possível entre dois colecionadores.
+
+    Representação por bits: a presença de cada figurinha é um bit de um bitset (tam_album / 8 bytes) e
+    apenas as figurinhas repetidas são guardadas em um dicionário com a quantidade em excesso. As trocas
+    são calculadas com operações entre os bitsets das coleções.
+
+    Exemplos:
+    >>> c = Colecao(100)
+    >>> c.visualizar()
+    '[]'
+    >>> c.repetidas()
+    '[]'
+    >>> c.insere(2)
+    >>> c.insere(1)
+    >>> c.insere(3)
+    >>> c.visualizar()
+    '[1, 2, 3]'
+    >>> c.repetidas()
+    '[]'
+    >>> c.insere(1)
+    >>> c.insere(2)
+    >>> c.insere(3)
+    >>> c.visualizar()
+    '[1, 2, 3]'
+    >>> c.repetidas()
+    '[1 (1), 2 (1), 3 (1)]'
+    >>> c.remove(1)
+    >>> c.visualizar()
+    '[1, 2, 3]'
+    >>> c.repetidas()
+    '[2 (1), 3 (1)]'
+
+    #troca
+    >>> c1 = Colecao(100)
+    >>> c2 = Colecao(100)
+    >>> c1.insere(1)
+    >>> c1.insere(3)
+    >>> c1.insere(4)
+    >>> c1.insere(4)
+    >>> c2.insere(1)
+    >>> c2.insere(2)
+    >>> c2.insere(2)
+    >>> c2.insere(3)
+    >>> c1.visualizar()
+    '[1, 3, 4]'
+    >>> c2.visualizar()
+    '[1, 2, 3]'
+    >>> c1.repetidas()
+    '[4 (1)]'
+    >>> c2.repetidas()
+    '[2 (1)]'
+    >>> c1.troca(c2)
+    >>> c1.visualizar()
+    '[1, 2, 3, 4]'
+    >>> c2.visualizar()
+    '[1, 2, 3, 4]'
+    >>> c1.repetidas()
+    '[]'
+    >>> c2.repetidas()
+    '[]'
+
+    '''
+
+    figurinhas: bitset
+    repetidas_qtd: dict[int, int]
+    tam_album: int
+    n_distintas: int
+    n_repetidas: int
+
+    def __init__(self, tam_album: int) -> None:
+        '''
+        Construtor da classe 'Colecao', que inicializa a coleção vazia. Recebe como parâmetro o tamanho do álbum.
+
+        Exemplos:
+        >>> c = Colecao(100)
+        >>> c.visualizar()
+        '[]'
+        >>> c.repetidas()
+        '[]'
+        '''
+
+        self.figurinhas = bitset(tam_album + 1)
+        self.repetidas_qtd = {}
+        self.tam_album = tam_album
+        self.n_distintas = 0
+        self.n_repetidas = 0
+
+
+
+    def insere(self, fig: int) -> None:
+        '''
+        Insere uma figurinha na coleção, sua posição é ajustada com base na sua enumeração.
+        Requer que a figurinha exista no álbum.
+
+        Exemplos:
+        #erro: a figurinha não existe.
+        >>> c = Colecao(100)
+        >>> c.insere(-1)
+        Traceback (most recent call last):
+        ...
+        ValueError: Figurinha não existe
+        >>> c.insere(101)
+        Traceback (most recent call last):
+        ...
+        ValueError: Figurinha não existe
+
+        #sucesso: a figurinha existe.
+        >>> c = Colecao(100)
+        >>> c.insere(1)
+        >>> c.visualizar()
+        '[1]'
+        >>> c.insere(3)
+        >>> c.visualizar()
+        '[1, 3]'
+        >>> c.insere(2)
+        >>> c.visualizar()
+        '[1, 2, 3]'
+        '''
+
+        if fig > self.tam_album or fig < 1:
+            raise ValueError('Figurinha não existe')
+
+        if fig in self.figurinhas:
+            self.repetidas_qtd[fig] = self.repetidas_qtd.get(fig, 0) + 1
+            self.n_repetidas += 1
+        else:
+            self.figurinhas.add(fig)
+            self.n_distintas += 1
+
+
+
+    def remove(self, fig: int) -> None:
+        '''
+        Remove uma figurinha da coleção. Requer que a figurinha exista e que haja ao menos 1 figurinha da removida na coleção.
+
+        Exemplos:
+        #erro: a figurinha não existe.
+        >>> c = Colecao(100) #erro: a figurinha não existe.
+        >>> c.insere(1)
+        >>> c.insere(2)
+        >>> c.insere(3)
+        >>> c.visualizar()
+        '[1, 2, 3]'
+        >>> c.remove(-1)
+        Traceback (most recent call last):
+        ...
+        ValueError: figurinha não faz parte do álbum (não existe)
+
+        #erro: a figurinha existe mas não está na coleção (não foi inserida).
+        >>> c = Colecao(100)
+        >>> c.insere(1)
+        >>> c.insere(2)
+        >>> c.insere(3)
+        >>> c.visualizar()
+        '[1, 2, 3]'
+        >>> c.remove(4)
+        Traceback (most recent call last):
+        ...
+        ValueError: figurinha não está na coleção (quantidade < 1)
+        
+        #sucesso: a figurinha existe e está na coleção.
+        >>> c = Colecao(100)
+        >>> c.insere(1)
+        >>> c.insere(2)
+        >>> c.insere(3)
+        >>> c.visualizar()
+        '[1, 2, 3]'
+        >>> c.remove(2)
+        >>> c.visualizar()
+        '[1, 3]'
+        '''
+
+        if fig > self.tam_album or fig < 1:
+            raise ValueError('figurinha não faz parte do álbum (não existe)')
+        elif fig not in self.figurinhas:
+            raise ValueError('figurinha não está na coleção (quantidade < 1)')
+
+        self.__retira(fig, 1)
+
+
+
+    def insere_muitos(self, figs: Iterable[int]) -> None:
+        '''
+        Insere todas as figurinhas de *figs* na coleção, como chamadas sucessivas de *insere*, mas
+        validando o lote inteiro antes de alterar a coleção e aplicando-o de uma só vez.
+
+        Exemplos:
+        >>> c = Colecao(100)
+        >>> c.insere(5)
+        >>> c.insere_muitos([7, 1, 5, 7, 7])
+        >>> c.visualizar()
+        '[1, 5, 7]'
+        >>> c.repetidas()
+        '[5 (1), 7 (2)]'
+        >>> c.insere_muitos([2, 101])
+        Traceback (most recent call last):
+        ...
+        ValueError: Figurinha não existe
+        >>> c.visualizar()
+        '[1, 5, 7]'
+        '''
+        lote = Counter(figs)
+        if lote and (min(lote) < 1 or max(lote) > self.tam_album):
+            raise ValueError('Figurinha não existe')
+
+        for fig, qtd in lote.items():
+            if fig not in self.figurinhas:
+                self.figurinhas.add(fig)
+                self.n_distintas += 1
+                qtd -= 1
+            self.n_repetidas += qtd
+            if qtd > 0:
+                self.repetidas_qtd[fig] = self.repetidas_qtd.get(fig, 0) + qtd
+
+
+
+    def remove_muitos(self, figs: Iterable[int]) -> None:
+        '''
+        Remove todas as figurinhas de *figs* da coleção, como chamadas sucessivas de *remove*, mas
+        validando o lote inteiro antes de alterar a coleção e aplicando-o de uma só vez.
+
+        Exemplos:
+        >>> c = Colecao(100)
+        >>> c.insere_muitos([1, 2, 2, 3, 3, 3])
+        >>> c.remove_muitos([3, 2, 3])
+        >>> c.visualizar()
+        '[1, 2, 3]'
+        >>> c.remove_muitos([1, 1])
+        Traceback (most recent call last):
+        ...
+        ValueError: figurinha não está na coleção (quantidade < 1)
+        >>> c.remove_muitos([0])
+        Traceback (most recent call last):
+        ...
+        ValueError: figurinha não faz parte do álbum (não existe)
+        >>> c.visualizar()
+        '[1, 2, 3]'
+        '''
+        lote = Counter(figs)
+        if lote and (min(lote) < 1 or max(lote) > self.tam_album):
+            raise ValueError('figurinha não faz parte do álbum (não existe)')
+        for fig, qtd in lote.items():
+            if self.quantidade(fig) < qtd:
+                raise ValueError('figurinha não está na coleção (quantidade < 1)')
+
+        for fig, qtd in lote.items():
+            self.__retira(fig, qtd)
+
+
+
+    def visualizar(self) -> str:
+        '''
+        Retorna uma string que representa a coleção, sem repetições.
+
+        Exemplos:
+        >>> c = Colecao(100)
+        >>> c.visualizar()
+        '[]'
+        >>> c.insere(1)
+        >>> c.insere(4)
+        >>> c.insere(2)
+        >>> c.insere(4)
+        >>> c.visualizar()
+        '[1, 2, 4]'
+        >>> c.remove(1)
+        >>> c.visualizar()
+        '[2, 4]'
+        '''
+
+        arquivo = io.StringIO()
+        self.escreve_visualizacao(arquivo)
+        return arquivo.getvalue()
+    
+
+
+    def repetidas(self) -> str:
+        '''
+        Retorna uma string que representa as figurinhas repetidas da coleção seguidas 
+        de sua quantidade em excesso entre parênteses.
+
+        Exemplos:
+        >>> c = Colecao(100)
+        >>> c.repetidas()
+        '[]'
+        >>> c.insere(1)
+        >>> c.insere(1)
+        >>> c.insere(2)
+        >>> c.insere(3)
+        >>> c.insere(3)
+        >>> c.visualizar()
+        '[1, 2, 3]'
+        >>> c.repetidas()
+        '[1 (1), 3 (1)]'
+        '''
+        
+        arquivo = io.StringIO()
+        self.escreve_repetidas(arquivo)
+        return arquivo.getvalue()
+    
+
+
+    def itera_possuidas(self) -> Iterator[int]:
+        '''
+        Itera, em ordem crescente e sem repetições, sobre as figurinhas da coleção.
+
+        Exemplos:
+        >>> c = Colecao(100)
+        >>> c.insere(4)
+        >>> c.insere(2)
+        >>> c.insere(4)
+        >>> list(c.itera_possuidas())
+        [2, 4]
+        '''
+        return iter(self.figurinhas)
+
+
+
+    def itera_repetidas(self) -> Iterator[tuple[int, int]]:
+        '''
+        Itera, em ordem crescente, sobre os pares (figurinha, quantidade em excesso) das figurinhas
+        repetidas da coleção.
+
+        Exemplos:
+        >>> c = Colecao(100)
+        >>> c.insere(4)
+        >>> c.insere(2)
+        >>> c.insere(4)
+        >>> c.insere(4)
+        >>> list(c.itera_repetidas())
+        [(4, 2)]
+        '''
+        for fig in sorted(self.repetidas_qtd):
+            yield fig, self.repetidas_qtd[fig]
+
+
+
+    def escreve_visualizacao(self, arquivo: TextIO) -> None:
+        '''
+        Escreve em *arquivo* a representação da coleção retornada por *visualizar*, em blocos,
+        sem montar a string completa.
+
+        Exemplos:
+        >>> import sys
+        >>> c = Colecao(100)
+        >>> c.insere(3)
+        >>> c.insere(1)
+        >>> c.escreve_visualizacao(sys.stdout)
+        [1, 3]
+        '''
+        escreve_listagem(arquivo, map(str, self.itera_possuidas()))
+
+
+
+    def escreve_repetidas(self, arquivo: TextIO) -> None:
+        '''
+        Escreve em *arquivo* a representação das repetidas retornada por *repetidas*, em blocos,
+        sem montar a string completa.
+
+        Exemplos:
+        >>> import sys
+        >>> c = Colecao(100)
+        >>> c.insere(3)
+        >>> c.insere(3)
+        >>> c.escreve_repetidas(sys.stdout)
+        [3 (1)]
+        '''
+        escreve_listagem(arquivo, (f'{fig} ({qtd})' for fig, qtd in self.itera_repetidas()))
+
+
+
+    def conjunto_possuidas(self) -> bitset:
+        '''
+        Retorna o conjunto (bitset) das figurinhas que estão na coleção. O
+        elemento *fig* do conjunto corresponde à figurinha *fig*.
+
+        Exemplos:
+        >>> c = Colecao(100)
+        >>> c.insere(5)
+        >>> c.insere(5)
+        >>> c.insere(9)
+        >>> list(c.conjunto_possuidas())
+        [5, 9]
+        '''
+        return self.figurinhas | bitset(self.tam_album + 1)
+
+
+
+    def conjunto_repetidas(self) -> bitset:
+        '''
+        Retorna o conjunto (bitset) das figurinhas repetidas da coleção.
+
+        Exemplos:
+        #figurinhas que faltam em c1 e estão repetidas em c2.
+        >>> c1 = Colecao(100)
+        >>> c2 = Colecao(100)
+        >>> c1.insere(1)
+        >>> c2.insere(1)
+        >>> c2.insere(1)
+        >>> c2.insere(7)
+        >>> c2.insere(7)
+        >>> c2.insere(8)
+        >>> list(c2.conjunto_repetidas() - c1.conjunto_possuidas())
+        [7]
+        >>> (c2.conjunto_repetidas() & c1.conjunto_possuidas()).count()
+        1
+        '''
+        return bitset.from_iterable(self.tam_album + 1, self.repetidas_qtd)
+
+
+
+    def _carrega(self, quantidades: Iterable[tuple[int, int]]) -> None:
+        '''
+        Carrega os pares (figurinha, quantidade) diretamente no bitset e no dicionário de
+        repetidas (usado por *convert*).
+        '''
+        for fig, qtd in quantidades:
+            self.figurinhas.add(fig)
+            self.n_distintas += 1
+            self.n_repetidas += qtd - 1
+            if qtd > 1:
+                self.repetidas_qtd[fig] = qtd - 1
+
+
+
+    def troca(self, col: Colecao) -> None:
+        '''
+        Realiza a troca de figurinhas entre dois colecionadores, na quantidade máxima possível (troca o máximo de figurinhas
+        não obtidas pelos recipientes, limitado ao número menor de figurinhas trocáveis de uma das coleções).
+
+        Exemplos:
+        #erro: álbuns de tamanhos diferentes.
+        >>> c1 = Colecao(100)
+        >>> c2 = Colecao(50)
+        >>> c1.insere(1)
+        >>> c1.insere(1)
+        >>> c2.insere(2)
+        >>> c2.insere(2)
+        >>> c1.visualizar()
+        '[1]'
+        >>> c2.visualizar()
+        '[2]'
+        >>> c1.troca(c2)
+        Traceback (most recent call last):
+        ...
+        ValueError: os álbuns não possuem o mesmo tamanho (diferentes)
+
+        #troca com um album contendo repetidas e outro sem repetidas (troca é possível mas não ocorre devido a falta de repetidas trocáveis em c2).
+        >>> c1 = Colecao(100)
+        >>> c2 = Colecao(100)
+        >>> c1.insere(1)
+        >>> c1.insere(2)
+        >>> c1.insere(3)
+        >>> c1.insere(4)
+        >>> c1.insere(4)
+        >>> c1.insere(4)
+        >>> c2.insere(1)
+        >>> c2.insere(2)
+        >>> c2.insere(3)
+        >>> c2.insere(5)
+        >>> c1.visualizar()
+        '[1, 2, 3, 4]'
+        >>> c2.visualizar()
+        '[1, 2, 3, 5]'
+        >>> c1.repetidas()
+        '[4 (2)]'
+        >>> c2.repetidas()
+        '[]'
+        >>> c1.troca(c2)
+        >>> c1.visualizar()
+        '[1, 2, 3, 4]'
+        >>> c2.visualizar()
+        '[1, 2, 3, 5]'
+
+        #troca com ambos os álbuns com repetidas mas sem nenhuma troca possível (sem mudança).
+        >>> c1 = Colecao(100)
+        >>> c2 = Colecao(100)
+        >>> c1.insere(1)
+        >>> c1.insere(2)
+        >>> c1.insere(3)
+        >>> c1.insere(4)
+        >>> c1.insere(4)
+        >>> c1.insere(4)
+        >>> c2.insere(1)
+        >>> c2.insere(2)
+        >>> c2.insere(3)
+        >>> c2.insere(5)
+        >>> c2.insere(1)
+        >>> c1.visualizar()
+        '[1, 2, 3, 4]'
+        >>> c2.visualizar()
+        '[1, 2, 3, 5]'
+        >>> c1.repetidas()
+        '[4 (2)]'
+        >>> c2.repetidas()
+        '[1 (1)]'
+        >>> c1.troca(c2)
+        >>> c1.visualizar()
+        '[1, 2, 3, 4]'
+        >>> c2.visualizar()
+        '[1, 2, 3, 5]'
+
+        #troca com nenhuma repetida (sem mudança).
+        >>> c1 = Colecao(100)
+        >>> c2 = Colecao(100)
+        >>> c1.insere(1)
+        >>> c1.insere(2)
+        >>> c1.insere(3)
+        >>> c2.insere(4)
+        >>> c2.insere(5)
+        >>> c2.insere(6)
+        >>> c1.visualizar()
+        '[1, 2, 3]'
+        >>> c2.visualizar()
+        '[4, 5, 6]'
+        >>> c1.troca(c2)
+        >>> c1.visualizar()
+        '[1, 2, 3]'
+        >>> c2.visualizar()
+        '[4, 5, 6]'
+
+        #Troca com repetidas trocáveis (sucesso).
+        >>> c1 = Colecao(100)
+        >>> c2 = Colecao(100)
+        >>> c1.insere(1)
+        >>> c1.insere(2)
+        >>> c1.insere(3)
+        >>> c1.insere(4)
+        >>> c1.insere(4)
+        >>> c1.insere(4)
+        >>> c2.insere(1)
+        >>> c2.insere(2)
+        >>> c2.insere(3)
+        >>> c2.insere(5)
+        >>> c2.insere(5)
+        >>> c1.visualizar()
+        '[1, 2, 3, 4]'
+        >>> c2.visualizar()
+        '[1, 2, 3, 5]'
+        >>> c1.troca(c2)
+        >>> c1.visualizar()
+        '[1, 2, 3, 4, 5]'
+        >>> c2.visualizar()
+        '[1, 2, 3, 4, 5]'
+        >>> c1.repetidas()
+        '[4 (1)]'
+        >>> c2.repetidas()
+        '[]'
+
+        #Verificação de ordem (as figurinhas trocadas devem ser escolhidas em ordem crescente).
+        >>> c1 = Colecao(100)
+        >>> c2 = Colecao(100)
+        >>> c1.insere(1)
+        >>> c1.insere(2)
+        >>> c1.insere(4)
+        >>> c1.insere(4)
+        >>> c2.insere(5)
+        >>> c2.insere(5)
+        >>> c2.insere(10)
+        >>> c2.insere(10)
+        >>> c1.visualizar()
+        '[1, 2, 4]'
+        >>> c1.repetidas()
+        '[4 (1)]'
+        >>> c2.visualizar()
+        '[5, 10]'
+        >>> c2.repetidas()
+        '[5 (1), 10 (1)]'
+        >>> c1.troca(c2)
+        >>> c1.visualizar()
+        '[1, 2, 4, 5]'
+        >>> c2.visualizar()
+        '[4, 5, 10]'
+        '''
+
+        if not isinstance(col, Colecao):
+            self._troca_generica(col)
+            return
+        if self.tam_album != col.tam_album:
+            raise ValueError('os álbuns não possuem o mesmo tamanho (diferentes)')
+
+        # figurinhas que o album1 (self) pode receber: faltam em self e são repetidas em col
+        trocaveis1 = col.conjunto_repetidas() - self.figurinhas
+        # figurinhas que o album2 (col) pode receber: são repetidas em self e faltam em col
+        trocaveis2 = self.conjunto_repetidas() - col.figurinhas
+
+        for fig1, fig2 in zip(trocaveis1, trocaveis2):
+            col.__retira(fig1, 1)
+            self.figurinhas.add(fig1)
+            self.__retira(fig2, 1)
+            col.figurinhas.add(fig2)
+            self.n_distintas += 1
+            col.n_distintas += 1
+
+
+
+    def quantidade(self, fig: int) -> int:
+        '''
+        Retorna a quantidade de cópias da figurinha *fig* na coleção (0 se ela não está na coleção).
+
+        Exemplos:
+        >>> c = Colecao(100)
+        >>> c.insere_muitos([3, 3, 5])
+        >>> c.quantidade(3), c.quantidade(4), c.quantidade(5)
+        (2, 0, 1)
+        '''
+        if fig not in self.figurinhas:
+            return 0
+        return 1 + self.repetidas_qtd.get(fig, 0)
+
+
+
+    def __retira(self, fig: int, qtd: int) -> None:
+        '''
+        Retira *qtd* cópias de *fig*, que devem estar na coleção.
+        '''
+        excesso = self.repetidas_qtd.get(fig, 0)
+        if qtd <= excesso:
+            if qtd == excesso:
+                del self.repetidas_qtd[fig]
+            else:
+                self.repetidas_qtd[fig] -= qtd
+            self.n_repetidas -= qtd
+        else:
+            self.repetidas_qtd.pop(fig, None)
+            self.figurinhas.discard(fig)
+            self.n_distintas -= 1
+            self.n_repetidas -= excesso
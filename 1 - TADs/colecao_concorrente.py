@@ -0,0 +1,196 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from itertools import count
+import threading
+from typing import Iterable, Iterator
+from colecao_tad import Colecao
+
+# Ordem global das travas: as trocas travam primeiro a coleção de menor número, de modo que
+# duas trocas envolvendo as mesmas coleções nunca esperam uma pela outra em ciclo.
+_sequencia = count()
+
+
+class ColecaoConcorrente:
+    '''
+    Uma coleção (de qualquer representação) protegida por uma trava própria, que pode ser
+    alterada por várias threads. Cada operação trava apenas a coleção envolvida; *troca* trava
+    as duas coleções sempre na mesma ordem, de modo que trocas entre pares disjuntos de
+    colecionadores podem ocorrer em paralelo sem risco de impasse (deadlock).
+
+    *aquisicoes* conta quantas vezes a trava foi obtida e *contencoes* quantas dessas vezes foi
+    preciso esperar por outra thread.
+
+    Exemplos:
+    >>> from concurrent.futures import ThreadPoolExecutor
+    >>> cols = [ColecaoConcorrente(Colecao.create(100)) for _ in range(4)]
+    >>> for i, c in enumerate(cols):
+    ...     c.insere_muitos([i + 1, i + 1, 50])
+    >>> def trabalho(i):
+    ...     for _ in range(100):
+    ...         cols[i].troca(cols[i ^ 1])
+    ...         cols[i].insere(60)
+    ...         cols[i].remove(60)
+    >>> with ThreadPoolExecutor(4) as executor:
+    ...     _ = list(executor.map(trabalho, range(4)))
+    >>> [c.visualizar() for c in cols]
+    ['[1, 2, 50]', '[1, 2, 50]', '[3, 4, 50]', '[3, 4, 50]']
+    >>> sum(c.distintas() for c in cols), cols[0].aquisicoes >= 300
+    (12, True)
+    '''
+
+    colecao: Colecao
+    ordem: int
+    aquisicoes: int
+    contencoes: int
+
+    def __init__(self, colecao: Colecao) -> None:
+        '''
+        Protege *colecao*, que a partir daqui deve ser alterada apenas por este objeto.
+        '''
+        self.colecao = colecao
+        self.ordem = next(_sequencia)
+        self.aquisicoes = 0
+        self.contencoes = 0
+        self.__trava = threading.Lock()
+
+
+
+    @contextmanager
+    def travada(self) -> Iterator[Colecao]:
+        '''
+        Trava a coleção durante o bloco *with*, fornecendo a coleção protegida, para operações
+        compostas que devem ser atômicas.
+
+        Exemplos:
+        >>> c = ColecaoConcorrente(Colecao.create(10))
+        >>> with c.travada() as col:
+        ...     col.insere(3)
+        ...     col.insere(3)
+        >>> c.repetidas(), c.contencoes
+        ('[3 (1)]', 0)
+        '''
+        self.__adquire()
+        try:
+            yield self.colecao
+        finally:
+            self.__trava.release()
+
+
+
+    def insere(self, fig: int) -> None:
+        '''
+        Insere *fig* na coleção (veja *Colecao.insere*).
+        '''
+        with self.travada() as c:
+            c.insere(fig)
+
+
+
+    def remove(self, fig: int) -> None:
+        '''
+        Remove *fig* da coleção (veja *Colecao.remove*).
+        '''
+        with self.travada() as c:
+            c.remove(fig)
+
+
+
+    def insere_muitos(self, figs: Iterable[int]) -> None:
+        '''
+        Insere as figurinhas de *figs* de uma só vez (veja *insere_muitos* das coleções).
+        '''
+        with self.travada() as c:
+            c.insere_muitos(figs)
+
+
+
+    def remove_muitos(self, figs: Iterable[int]) -> None:
+        '''
+        Remove as figurinhas de *figs* de uma só vez (veja *remove_muitos* das coleções).
+        '''
+        with self.travada() as c:
+            c.remove_muitos(figs)
+
+
+
+    def visualizar(self) -> str:
+        '''
+        Retorna a representação da coleção (veja *Colecao.visualizar*).
+        '''
+        with self.travada() as c:
+            return c.visualizar()
+
+
+
+    def repetidas(self) -> str:
+        '''
+        Retorna a representação das repetidas (veja *Colecao.repetidas*).
+        '''
+        with self.travada() as c:
+            return c.repetidas()
+
+
+
+    def distintas(self) -> int:
+        '''
+        Retorna a quantidade de figurinhas distintas da coleção.
+        '''
+        with self.travada() as c:
+            return c.distintas()
+
+
+
+    def total_repetidas(self) -> int:
+        '''
+        Retorna o total de figurinhas repetidas da coleção.
+        '''
+        with self.travada() as c:
+            return c.total_repetidas()
+
+
+
+    def faltantes(self) -> int:
+        '''
+        Retorna quantas figurinhas do álbum faltam na coleção.
+        '''
+        with self.travada() as c:
+            return c.faltantes()
+
+
+
+    def troca(self, col: ColecaoConcorrente) -> None:
+        '''
+        Realiza a troca (veja *Colecao.troca*) com *col*, travando as duas coleções na ordem
+        global das travas.
+
+        Exemplos:
+        >>> c1 = ColecaoConcorrente(Colecao.create(10))
+        >>> c2 = ColecaoConcorrente(Colecao.create(10))
+        >>> c1.insere_muitos([1, 1])
+        >>> c2.insere_muitos([2, 2])
+        >>> c2.troca(c1)
+        >>> c1.visualizar(), c2.visualizar()
+        ('[1, 2]', '[1, 2]')
+        >>> c1.troca(c1)
+        >>> c1.visualizar()
+        '[1, 2]'
+        '''
+        if col is self:
+            with self.travada() as c:
+                c.troca(c)
+            return
+
+        primeira, segunda = (self, col) if self.ordem < col.ordem else (col, self)
+        with primeira.travada(), segunda.travada():
+            self.colecao.troca(col.colecao)
+
+
+
+    def __adquire(self) -> None:
+        '''
+        Obtém a trava, contando as aquisições e as vezes em que foi preciso esperar.
+        '''
+        if not self.__trava.acquire(blocking=False):
+            self.__trava.acquire()
+            self.contencoes += 1
+        self.aquisicoes += 1
@@ -1,14 +1,36 @@
 from __future__ import annotations
 from dataclasses import dataclass
-
-@dataclass
+from collections import Counter
+import random
+from typing import Iterable, Iterator, TextIO
+import io
+from colecao_saida import escreve_listagem
+from colecao_tad import Colecao as ColecaoTAD, RelatorioTroca
+
+@dataclass(slots=True)
 class No:
+    '''
+    Nó do encadeamento de uma coleção: a figurinha *item* e a quantidade *qtd* de cópias dela.
+    '''
     item: int
+    qtd: int
     prox: No | None
 
 
+@dataclass(slots=True)
+class NoIndice:
+    '''
+    Nó de um nível do índice (lista com saltos) de uma coleção. *abaixo* é o nó com o mesmo *item* no
+    nível inferior do índice ou, no nível 0, o nó do encadeamento das figurinhas. Nos nós sentinela
+    (item 0) do nível 0, *abaixo* é None.
+    '''
+    item: int
+    abaixo: NoIndice | No | None
+    prox: NoIndice | None
+
+
 
-class Colecao:
+class Colecao(ColecaoTAD):
     '''
     Uma classe que representa uma coleção de figurinhas, com métodos para adicionar e remover figurinhas,
     vizualizar a coleção e realizar a troca entre a quantidade máxima possível entre dois colecionadores.
@@ -70,20 +92,42 @@ class Colecao:
 
     figurinhas: No | None
     tam_album: int
+    indice: list[NoIndice] | None
+    n_distintas: int
+    n_repetidas: int
 
-    def __init__(self, tam_album: int) -> None:
+    def __init__(self, tam_album: int, indexada: bool = False) -> None:
         '''
         Construtor da classe 'Colecao', que inicializa a coleção vazia. Recebe como parâmetro o tamanho do álbum.
 
+        Se *indexada* é True, a coleção mantém sobre o encadeamento uma lista com saltos (*indice*, com
+        os nós sentinela de cada nível, do mais baixo ao mais alto), de modo que *insere*, *remove* e
+        *quantidade* têm custo esperado O(log n) no número de figurinhas distintas. O encadeamento em
+        *figurinhas* continua sendo a representação da coleção.
+
         Exemplos:
         >>> colecao = Colecao(100)
         >>> colecao.visualizar()
         '[]'
         >>> colecao.repetidas()
         '[]'
+        >>> colecao = Colecao(1000, indexada=True)
+        >>> for fig in range(1000, 0, -3):
+        ...     colecao.insere(fig)
+        >>> colecao.quantidade(997), colecao.quantidade(998)
+        (1, 0)
+        >>> colecao.remove(997)
+        >>> colecao.insere(4)
+        >>> colecao.quantidade(997), colecao.quantidade(4)
+        (0, 2)
+        >>> colecao.visualizar()[:16]
+        '[1, 4, 7, 10, 13'
         '''
         self.figurinhas = None
         self.tam_album = tam_album
+        self.indice = [NoIndice(0, None, None)] if indexada else None
+        self.n_distintas = 0
+        self.n_repetidas = 0
 
 
 
@@ -119,15 +163,21 @@ class Colecao:
         '''
         if fig < 1 or fig > self.tam_album:
             raise ValueError('Figurinha não existe')
-        elif self.figurinhas is None:
-            self.figurinhas = No(fig, None)
-        elif fig < self.figurinhas.item:
-            self.figurinhas = No(fig, self.figurinhas)
+
+        anterior, caminho = self.__localiza(fig)
+        no = self.figurinhas if anterior is None else anterior.prox
+        if no is not None and no.item == fig:
+            no.qtd += 1
+            self.n_repetidas += 1
         else:
-            no = self.figurinhas
-            while no.prox is not None and fig > no.prox.item:
-                no = no.prox
-            no.prox = No(fig, no.prox)
+            self.n_distintas += 1
+            novo = No(fig, 1, no)
+            if anterior is None:
+                self.figurinhas = novo
+            else:
+                anterior.prox = novo
+            if caminho is not None:
+                self.__indexa(novo, caminho)
 
 
 
@@ -173,27 +223,138 @@ class Colecao:
         '''
         if fig < 1 or fig > self.tam_album:
             raise ValueError('figurinha não faz parte do álbum (não existe)')
-        elif self.figurinhas is None:
+
+        anterior, caminho = self.__localiza(fig)
+        no = self.figurinhas if anterior is None else anterior.prox
+        if no is None or no.item != fig:
             raise ValueError('figurinha não está na coleção (quantidade < 1)')
+        elif no.qtd > 1:
+            no.qtd -= 1
+            self.n_repetidas -= 1
+        else:
+            self.n_distintas -= 1
+            if anterior is None:
+                self.figurinhas = no.prox
+            else:
+                anterior.prox = no.prox
+            if caminho is not None:
+                for nivel in caminho:
+                    if nivel.prox is not None and nivel.prox.item == fig:
+                        nivel.prox = nivel.prox.prox
 
-        no = self.figurinhas
-        if no is not None and no.prox is None and no.item == fig:
-            self.figurinhas = None
-            return
-        elif no.item == fig:
-            self.figurinhas = no.prox
-            return
 
-        while no.prox is not None and fig != no.prox.item:
+
+    def quantidade(self, fig: int) -> int:
+        '''
+        Retorna a quantidade de cópias da figurinha *fig* na coleção (0 se ela não está na coleção).
+
+        Exemplos:
+        >>> c = Colecao(100)
+        >>> c.insere_muitos([3, 3, 5])
+        >>> c.quantidade(3), c.quantidade(4), c.quantidade(5)
+        (2, 0, 1)
+        '''
+        anterior, _ = self.__localiza(fig)
+        no = self.figurinhas if anterior is None else anterior.prox
+        if no is not None and no.item == fig:
+            return no.qtd
+        return 0
+
+
+
+    def insere_muitos(self, figs: Iterable[int]) -> None:
+        '''
+        Insere todas as figurinhas de *figs* na coleção, como chamadas sucessivas de *insere*, mas
+        validando o lote inteiro antes de alterar a coleção e aplicando-o de uma só vez.
+
+        Exemplos:
+        >>> c = Colecao(100)
+        >>> c.insere(5)
+        >>> c.insere_muitos([7, 1, 5, 7, 7])
+        >>> c.visualizar()
+        '[1, 5, 7]'
+        >>> c.repetidas()
+        '[5 (1), 7 (2)]'
+        >>> c.insere_muitos([2, 101])
+        Traceback (most recent call last):
+        ...
+        ValueError: Figurinha não existe
+        >>> c.visualizar()
+        '[1, 5, 7]'
+        '''
+        lote = Counter(figs)
+        if lote and (min(lote) < 1 or max(lote) > self.tam_album):
+            raise ValueError('Figurinha não existe')
+
+        # Intercala o lote ordenado com o encadeamento em um único percurso.
+        cabeca = No(0, 0, self.figurinhas)
+        no = cabeca
+        for fig in sorted(lote):
+            while no.prox is not None and no.prox.item < fig:
+                no = no.prox
+            if no.prox is not None and no.prox.item == fig:
+                no.prox.qtd += lote[fig]
+                self.n_repetidas += lote[fig]
+            else:
+                no.prox = No(fig, lote[fig], no.prox)
+                self.n_distintas += 1
+                self.n_repetidas += lote[fig] - 1
             no = no.prox
+        self.figurinhas = cabeca.prox
+        self.__reconstroi_indice()
 
-        if no.prox is None:
-            raise ValueError('figurinha não está na coleção (quantidade < 1)')
-        else:
-            if no.prox.prox is not None:
+
+
+    def remove_muitos(self, figs: Iterable[int]) -> None:
+        '''
+        Remove todas as figurinhas de *figs* da coleção, como chamadas sucessivas de *remove*, mas
+        validando o lote inteiro antes de alterar a coleção e aplicando-o de uma só vez.
+
+        Exemplos:
+        >>> c = Colecao(100)
+        >>> c.insere_muitos([1, 2, 2, 3, 3, 3])
+        >>> c.remove_muitos([3, 2, 3])
+        >>> c.visualizar()
+        '[1, 2, 3]'
+        >>> c.remove_muitos([1, 1])
+        Traceback (most recent call last):
+        ...
+        ValueError: figurinha não está na coleção (quantidade < 1)
+        >>> c.remove_muitos([0])
+        Traceback (most recent call last):
+        ...
+        ValueError: figurinha não faz parte do álbum (não existe)
+        >>> c.visualizar()
+        '[1, 2, 3]'
+        '''
+        lote = Counter(figs)
+        if lote and (min(lote) < 1 or max(lote) > self.tam_album):
+            raise ValueError('figurinha não faz parte do álbum (não existe)')
+        # Obtém, em um único percurso, quantas cópias de cada figurinha do lote há na coleção.
+        disponiveis: Counter[int] = Counter()
+        no = self.figurinhas
+        while no is not None:
+            if no.item in lote:
+                disponiveis[no.item] = no.qtd
+            no = no.prox
+        for fig, qtd in lote.items():
+            if disponiveis[fig] < qtd:
+                raise ValueError('figurinha não está na coleção (quantidade < 1)')
+
+        # Desconta o lote em um único percurso, retirando os nós que ficam sem cópias.
+        cabeca = No(0, 0, self.figurinhas)
+        no = cabeca
+        while no.prox is not None:
+            if no.prox.qtd == lote[no.prox.item]:
+                self.n_distintas -= 1
+                self.n_repetidas -= no.prox.qtd - 1
                 no.prox = no.prox.prox
             else:
-                no.prox = None    
+                no.prox.qtd -= lote[no.prox.item]
+                self.n_repetidas -= lote[no.prox.item]
+                no = no.prox
+        self.figurinhas = cabeca.prox
+        self.__reconstroi_indice()
 
 
 
@@ -215,24 +376,10 @@ class Colecao:
         >>> colecao.visualizar()
         '[2, 4]'
         '''
-        if self.figurinhas is None:
-            return '[]'
-        else:
-            s = '['
-            anterior: None | int = None
-            no = self.figurinhas
-            final = False
-            while not final:
-                if no.item != anterior:
-                    s += str(no.item) + ', '
-                anterior = no.item
-                if no.prox is None:
-                    final = True
-                else:
-                    no = no.prox
-
-            return s[:-2] + ']'
-    
+        arquivo = io.StringIO()
+        self.escreve_visualizacao(arquivo)
+        return arquivo.getvalue()
+
 
 
     def repetidas(self) -> str:
@@ -253,33 +400,102 @@ class Colecao:
         >>> colecao.repetidas()
         '[1 (1), 3 (1)]'
         '''
-        if self.figurinhas is None:
-            return '[]'
-        else:
-            s = '['
-            anterior: None | int = None
-            no = self.figurinhas
-            final = False
-            while not final:
-                if no.item != anterior:
-                    qtd = 1
-                    no_aux = no.prox
-                    while no_aux is not None and no_aux.item == no.item:
-                        qtd += 1
-                        no_aux = no_aux.prox
-                    if qtd > 1:
-                        s += f'{no.item} ({qtd - 1}), '
-                anterior = no.item
-                if no.prox is None:
-                    final = True
-                else:
-                    no = no.prox
-
-    
-            if s == '[':
-                return '[]'
-            return s[:-2] + ']'
-    
+        arquivo = io.StringIO()
+        self.escreve_repetidas(arquivo)
+        return arquivo.getvalue()
+
+
+
+    def itera_possuidas(self) -> Iterator[int]:
+        '''
+        Itera, em ordem crescente e sem repetições, sobre as figurinhas da coleção.
+
+        Exemplos:
+        >>> c = Colecao(100)
+        >>> c.insere(4)
+        >>> c.insere(2)
+        >>> c.insere(4)
+        >>> list(c.itera_possuidas())
+        [2, 4]
+        '''
+        no = self.figurinhas
+        while no is not None:
+            yield no.item
+            no = no.prox
+
+
+
+    def itera_repetidas(self) -> Iterator[tuple[int, int]]:
+        '''
+        Itera, em ordem crescente, sobre os pares (figurinha, quantidade em excesso) das figurinhas
+        repetidas da coleção.
+
+        Exemplos:
+        >>> c = Colecao(100)
+        >>> c.insere(4)
+        >>> c.insere(2)
+        >>> c.insere(4)
+        >>> c.insere(4)
+        >>> list(c.itera_repetidas())
+        [(4, 2)]
+        '''
+        no = self.figurinhas
+        while no is not None:
+            if no.qtd > 1:
+                yield no.item, no.qtd - 1
+            no = no.prox
+
+
+
+    def escreve_visualizacao(self, arquivo: TextIO) -> None:
+        '''
+        Escreve em *arquivo* a representação da coleção retornada por *visualizar*, em blocos,
+        sem montar a string completa.
+
+        Exemplos:
+        >>> import sys
+        >>> c = Colecao(100)
+        >>> c.insere(3)
+        >>> c.insere(1)
+        >>> c.escreve_visualizacao(sys.stdout)
+        [1, 3]
+        '''
+        escreve_listagem(arquivo, map(str, self.itera_possuidas()))
+
+
+
+    def escreve_repetidas(self, arquivo: TextIO) -> None:
+        '''
+        Escreve em *arquivo* a representação das repetidas retornada por *repetidas*, em blocos,
+        sem montar a string completa.
+
+        Exemplos:
+        >>> import sys
+        >>> c = Colecao(100)
+        >>> c.insere(3)
+        >>> c.insere(3)
+        >>> c.escreve_repetidas(sys.stdout)
+        [3 (1)]
+        '''
+        escreve_listagem(arquivo, (f'{fig} ({qtd})' for fig, qtd in self.itera_repetidas()))
+
+
+
+    def _carrega(self, quantidades: Iterable[tuple[int, int]]) -> None:
+        '''
+        Monta o encadeamento diretamente a partir dos pares (figurinha, quantidade), em ordem
+        crescente (usado por *convert*).
+        '''
+        cabeca = No(0, 0, None)
+        ultimo = cabeca
+        for fig, qtd in quantidades:
+            ultimo.prox = No(fig, qtd, None)
+            ultimo = ultimo.prox
+            self.n_distintas += 1
+            self.n_repetidas += qtd - 1
+        self.figurinhas = cabeca.prox
+        self.__reconstroi_indice()
+
 
 
     def troca(self, colecionador: Colecao) -> None:
@@ -459,114 +675,164 @@ class Colecao:
         >>> c2.visualizar()
         '[4, 5, 10]'
         '''
-        if self.tam_album != colecionador.tam_album:
-            raise ValueError('os álbuns não possuem o mesmo tamanho (diferentes)')
-        
-        no1 = self.__no_sem_repeticao()
-        no2 = colecionador.__no_sem_repeticao()
+        self.troca_maxima(colecionador)
 
-        repetidas1 = self.__no_repetidas()
-        repetidas2 = colecionador.__no_repetidas()
 
-        recebiveis1: No | None = None
-        recebiveis2: No | None = None
 
-        # O propósito dos loops a seguir é criar dois encadeamentos com as figurinhas que podem ser trocadas.
-        while repetidas2 is not None and no1 is not None:
-            if no1.prox is None and no1.item > repetidas2.item: #garante que a última figurinha de no1 seja verificada.
-                recebiveis1 = No(repetidas2.item, recebiveis1)
-                repetidas2 = repetidas2.prox
-            elif no1 is not None and no1.item > repetidas2.item: #se a figurinha de no1 é maior que a de repetidas2, avança o no1.
-                no1 = no1.prox
-            elif no1 is not None and no1.item < repetidas2.item: #se a figurinha de no1 é menor que a de repetidas2, adiciona a figurinha de repetidas2 ao encadeamento recebiveis1.
-                recebiveis1 = No(repetidas2.item, recebiveis1)
-                repetidas2 = repetidas2.prox
-            elif no1 is not None and no1.item == repetidas2.item: #se as figurinhas são iguais, avança ambos os encadeamentos. (a figurinha repetida não se caracteriza como trocável, pois já está no álbum)
+    def troca_maxima(self, colecionador: Colecao, simular: bool = False) -> RelatorioTroca:
+        '''
+        Calcula e realiza a mesma troca de *troca*, retornando um relatório com os pares trocados
+        (figurinha recebida por self, figurinha recebida por *colecionador*). As figurinhas trocáveis são
+        encontradas percorrendo os dois encadeamentos simultaneamente uma única vez, e cada figurinha
+        recebida é ligada diretamente no encadeamento do recipiente (um nó novo por figurinha recebida,
+        sem encadeamentos temporários). Se *simular* é True, as coleções não são alteradas.
+
+        Exemplos:
+        >>> c1 = Colecao(100)
+        >>> c2 = Colecao(100, indexada=True)
+        >>> c1.insere_muitos([1, 2, 4, 4, 6, 6])
+        >>> c2.insere_muitos([3, 5, 5, 10, 10, 10])
+        >>> c1.troca_maxima(c2, simular=True)
+        RelatorioTroca(pares=[(5, 4), (10, 6)])
+        >>> c1.visualizar()
+        '[1, 2, 4, 6]'
+        >>> c1.troca_maxima(c2).quantidade()
+        2
+        >>> c1.visualizar(), c1.repetidas()
+        ('[1, 2, 4, 5, 6, 10]', '[]')
+        >>> c2.visualizar(), c2.repetidas()
+        ('[3, 4, 5, 6, 10]', '[10 (1)]')
+        >>> c2.quantidade(4)
+        1
+        '''
+        if not isinstance(colecionador, Colecao):
+            return self._troca_generica(colecionador, simular)
+        if self.tam_album != colecionador.tam_album:
+            raise ValueError('os álbuns não possuem o mesmo tamanho (diferentes)')
+
+        # Cada figurinha trocável é guardada junto com o último nó do recipiente anterior a ela
+        # (onde ela será ligada) e o nó do doador (de onde sai a cópia).
+        recebiveis1: list[tuple[No | None, No]] = []
+        recebiveis2: list[tuple[No | None, No]] = []
+        ant1: No | None = None
+        ant2: No | None = None
+        no1 = self.figurinhas
+        no2 = colecionador.figurinhas
+        while no1 is not None or no2 is not None:
+            if no2 is None or (no1 is not None and no1.item < no2.item): # figurinha só em self
+                if no1.qtd > 1:
+                    recebiveis2.append((ant2, no1))
+                ant1 = no1
                 no1 = no1.prox
-                repetidas2 = repetidas2.prox
-            else:
-                repetidas2 = repetidas2.prox
-        
-        while repetidas1 is not None and no2 is not None:
-            if no2.prox is None and no2.item > repetidas1.item:
-                recebiveis2 = No(repetidas1.item, recebiveis2)
-                repetidas1 = repetidas1.prox
-            elif no2 is not None and no2.item > repetidas1.item:
-                no2 = no2.prox
-            elif no2 is not None and no2.item < repetidas1.item:
-                recebiveis2 = No(repetidas1.item, recebiveis2)
-                repetidas1 = repetidas1.prox
-            elif no2 is not None and no2.item == repetidas1.item:
+            elif no1 is None or no2.item < no1.item: # figurinha só em colecionador
+                if no2.qtd > 1:
+                    recebiveis1.append((ant1, no2))
+                ant2 = no2
                 no2 = no2.prox
-                repetidas1 = repetidas1.prox
+            else: # figurinha nas duas coleções
+                ant1, no1 = no1, no1.prox
+                ant2, no2 = no2, no2.prox
+
+        k = min(len(recebiveis1), len(recebiveis2))
+        pares = [(recebiveis1[i][1].item, recebiveis2[i][1].item) for i in range(k)]
+        if not simular and k > 0:
+            self.__recebe(recebiveis1[:k])
+            colecionador.__recebe(recebiveis2[:k])
+            self.__reconstroi_indice()
+            colecionador.__reconstroi_indice()
+            # cada par dá a cada coleção uma figurinha nova em troca de uma repetida
+            for c in (self, colecionador):
+                c.n_distintas += k
+                c.n_repetidas -= k
+        return RelatorioTroca(pares)
+
+
+
+    def __recebe(self, recebiveis: list[tuple[No | None, No]]) -> None:
+        '''
+        Passa para a coleção uma cópia de cada figurinha de *recebiveis* (em ordem crescente), obtidos
+        por *troca_maxima*, ligando um nó novo após o nó anterior registrado. Figurinhas seguidas com
+        o mesmo nó anterior são ligadas uma após a outra, a partir do último nó ligado, de modo que
+        cada figurinha é ligada em tempo constante.
+        '''
+        ultimo: No | None = None # último nó ligado
+        ultimo_ant: No | None = None # nó anterior registrado para o último nó ligado
+        for anterior, doador in recebiveis:
+            fig = doador.item
+            doador.qtd -= 1
+            registrado = anterior
+            if ultimo is not None and anterior is ultimo_ant:
+                anterior = ultimo
+            if anterior is None:
+                self.figurinhas = No(fig, 1, self.figurinhas)
+                ultimo = self.figurinhas
             else:
-                repetidas1 = repetidas1.prox
-        
-        while recebiveis1 is not None and recebiveis2 is not None: #insere e remove as figurinhas trocadas enquanto nenhum dos encadeamentos chega ao fim.
-            self.insere(recebiveis1.item)
-            colecionador.insere(recebiveis2.item)
-            self.remove(recebiveis2.item)
-            colecionador.remove(recebiveis1.item)
-            recebiveis1 = recebiveis1.prox
-            recebiveis2 = recebiveis2.prox
+                anterior.prox = No(fig, 1, anterior.prox)
+                ultimo = anterior.prox
+            ultimo_ant = registrado
 
 
 
-    def __no_repetidas(self) -> No | None:
+    def __localiza(self, fig: int) -> tuple[No | None, list[NoIndice] | None]:
         '''
-        Retorna um encadeamento com as figurinhas repetidas de uma coleção. (ordem decrescente, sem repetições)
-        Exemplos:
-        >>> c = Colecao(100)
-        >>> c.insere(1)
-        >>> c.insere(2)
-        >>> c.insere(3)
-        >>> c._Colecao__no_repetidas()
-
-        >>> c.insere(1)
-        >>> c.insere(2)
-        >>> c._Colecao__no_repetidas()
-        No(item=2, prox=No(item=1, prox=None))
+        Retorna o último nó do encadeamento com item menor que *fig* (None se não há) e, se a coleção
+        é indexada, o último nó de cada nível do índice com item menor que *fig* (do nível 0 ao mais alto).
         '''
-        no_repetidas: No | None = None
-        anterior: None | int = None
-        no = self.figurinhas
-        while no is not None:
-            if no.item != anterior:
-                qtd = 1
-                no_aux = no.prox
-                while no_aux is not None and no_aux.item == no.item:
-                    qtd += 1
-                    no_aux = no_aux.prox
-                if qtd > 1:
-                    no_repetidas = No(no.item, no_repetidas)
-            anterior = no.item
+        anterior: No | None = None
+        caminho: list[NoIndice] | None = None
+        if self.indice is not None:
+            caminho = list(self.indice)
+            x = self.indice[-1]
+            for nivel in range(len(self.indice) - 1, -1, -1):
+                while x.prox is not None and x.prox.item < fig:
+                    x = x.prox
+                caminho[nivel] = x
+                if nivel > 0:
+                    x = x.abaixo  # type: ignore
+            anterior = x.abaixo  # type: ignore
+
+        no = self.figurinhas if anterior is None else anterior.prox
+        while no is not None and no.item < fig:
+            anterior = no
             no = no.prox
-        return no_repetidas
-    
+        return anterior, caminho
 
-    def __no_sem_repeticao(self) -> No | None:
+
+    def __indexa(self, novo: No, caminho: list[NoIndice]) -> None:
         '''
-        Retorna um encadeamento com as figurinhas sem repetição de uma coleção. (ordem decrescente, sem repetições)
-        Exemplos:
-        >>> c = Colecao(100)
-        >>> c.insere(1)
-        >>> c.insere(2)
-        >>> c.insere(3)
-        >>> c._Colecao__no_sem_repeticao()
-        No(item=3, prox=No(item=2, prox=No(item=1, prox=None)))
-        >>> c.insere(1)
-        >>> c.insere(2)
-        >>> c._Colecao__no_sem_repeticao()
-        No(item=3, prox=No(item=2, prox=No(item=1, prox=None)))
+        Adiciona *novo* ao índice em uma quantidade aleatória de níveis (cada nível com probabilidade 1/2
+        do anterior), usando os nós de *caminho* obtidos por *__localiza*.
+        '''
+        assert self.indice is not None
+        abaixo: NoIndice | No = novo
+        nivel = 0
+        while random.random() < 0.5:
+            if nivel == len(self.indice):
+                sentinela = NoIndice(0, self.indice[-1], None)
+                self.indice.append(sentinela)
+                caminho.append(sentinela)
+            anterior = caminho[nivel]
+            anterior.prox = NoIndice(novo.item, abaixo, anterior.prox)
+            abaixo = anterior.prox
+            nivel += 1
+
+
+    def __reconstroi_indice(self) -> None:
+        '''
+        Reconstrói o índice de uma coleção indexada a partir do encadeamento, em tempo linear. Usado
+        pelas operações que alteram o encadeamento diretamente.
         '''
-        no_sem_repeticao: No | None = None
-        anterior: None | int = None
+        if self.indice is None:
+            return
+        self.indice = [NoIndice(0, None, None)]
+        ultimos = list(self.indice)
         no = self.figurinhas
         while no is not None:
-            if no.item != anterior:
-                no_sem_repeticao = No(no.item, no_sem_repeticao)
-            anterior = no.item
+            self.__indexa(no, ultimos)
+            for nivel in range(len(ultimos)):
+                if ultimos[nivel].prox is not None:
+                    ultimos[nivel] = ultimos[nivel].prox  # type: ignore
             no = no.prox
-        return no_sem_repeticao
+
 
 #oie
\ No newline at end of file
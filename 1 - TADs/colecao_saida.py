@@ -0,0 +1,27 @@
+from __future__ import annotations
+from itertools import islice
+from typing import Iterable, TextIO
+
+
+def escreve_listagem(arquivo: TextIO, itens: Iterable[str], tam_bloco: int = 4096) -> None:
+    '''
+    Escreve em *arquivo* os *itens* no formato de listagem das coleções ('[a, b, c]').
+    Os itens são consumidos e escritos em blocos de até *tam_bloco* itens, de modo que a
+    listagem completa nunca precisa estar em memória.
+
+    Exemplos:
+    >>> import sys
+    >>> escreve_listagem(sys.stdout, [])
+    []
+    >>> escreve_listagem(sys.stdout, map(str, range(1, 8)), tam_bloco=3)
+    [1, 2, 3, 4, 5, 6, 7]
+    '''
+    arquivo.write('[')
+    it = iter(itens)
+    sep = ''
+    bloco = list(islice(it, tam_bloco))
+    while bloco:
+        arquivo.write(sep + ', '.join(bloco))
+        sep = ', '
+        bloco = list(islice(it, tam_bloco))
+    arquivo.write(']')
@@ -1,3 +1,77 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import importlib
+from typing import BinaryIO, Iterable, Iterator
+import colecao_arquivo
+
+# Módulo que implementa cada representação (backend) de coleção.
+BACKENDS = {
+    'arranjo': 'colecao_arranjo',
+    'no': 'colecao_no',
+    'esparsa': 'colecao_esparsa',
+    'bitset': 'colecao_bitset',
+}
+
+# Modelo de custo (memória, em bytes) de cada representação: (bytes por figurinha do álbum,
+# bytes por figurinha distinta na coleção). O encadeamento ('no') tem acesso linear e só é
+# usado quando pedido explicitamente.
+CUSTOS = {
+    'arranjo': (4.0, 0.0),
+    'esparsa': (0.0, 100.0),
+    'bitset': (0.125, 50.0),
+    'no': (0.0, 120.0),
+}
+AUTOMATICOS = ('arranjo', 'esparsa', 'bitset')
+
+
+def custo_estimado(backend: str, tam_album: int, distintas: int) -> float:
+    '''
+    Estima a memória, em bytes, usada pela representação *backend* para uma coleção de um álbum
+    de *tam_album* figurinhas com *distintas* figurinhas distintas.
+
+    Exemplos:
+    >>> custo_estimado('arranjo', 1000, 10)
+    4000.0
+    >>> custo_estimado('esparsa', 1000, 10)
+    1000.0
+    >>> custo_estimado('bitset', 1000, 10)
+    625.0
+    '''
+    por_album, por_distinta = CUSTOS[backend]
+    return por_album * tam_album + por_distinta * distintas
+
+
+def escolhe_backend(tam_album: int, distintas: int) -> str:
+    '''
+    Retorna a representação automática (entre AUTOMATICOS) de menor custo estimado para uma
+    coleção com *distintas* figurinhas distintas de um álbum de *tam_album* figurinhas.
+
+    Exemplos:
+    >>> escolhe_backend(1_000_000, 100)
+    'esparsa'
+    >>> escolhe_backend(1_000_000, 10_000)
+    'bitset'
+    >>> escolhe_backend(1000, 500)
+    'arranjo'
+    '''
+    return min(AUTOMATICOS, key=lambda b: custo_estimado(b, tam_album, distintas))
+
+
+@dataclass
+class RelatorioTroca:
+    '''
+    Resultado de uma troca entre duas coleções: cada par é (figurinha recebida pela primeira
+    coleção, figurinha recebida pela segunda).
+    '''
+    pares: list[tuple[int, int]]
+
+    def quantidade(self) -> int:
+        '''
+        Retorna o número de figurinhas trocadas por cada colecionador.
+        '''
+        return len(self.pares)
+
+
 class Colecao:
     '''
     Uma classe que representa uma coleção de figurinhas, com métodos para adicionar e remover figurinhas,
@@ -317,4 +391,226 @@ class Colecao:
         '''
         pass
 
-    
\ No newline at end of file
+
+    @staticmethod
+    def create(tam_album: int, backend: str = 'auto', distintas_esperadas: int | None = None) -> Colecao:
+        '''
+        Cria uma coleção vazia para um álbum de *tam_album* figurinhas usando a representação
+        *backend* (uma das chaves de BACKENDS). Com backend='auto', a representação é escolhida
+        pelo modelo de custo (*escolhe_backend*) a partir da quantidade esperada de figurinhas
+        distintas; sem *distintas_esperadas*, supõe-se o álbum completo.
+
+        Exemplos:
+        >>> type(Colecao.create(100)).__module__
+        'colecao_arranjo'
+        >>> type(Colecao.create(1_000_000, distintas_esperadas=50)).__module__
+        'colecao_esparsa'
+        >>> c = Colecao.create(100, backend='no')
+        >>> type(c).__module__, isinstance(c, Colecao)
+        ('colecao_no', True)
+        >>> Colecao.create(100, backend='lista')
+        Traceback (most recent call last):
+        ...
+        ValueError: representação desconhecida: lista
+        '''
+        if backend == 'auto':
+            if distintas_esperadas is None:
+                distintas_esperadas = tam_album
+            backend = escolhe_backend(tam_album, distintas_esperadas)
+        elif backend not in BACKENDS:
+            raise ValueError(f'representação desconhecida: {backend}')
+        modulo = importlib.import_module(BACKENDS[backend])
+        return modulo.Colecao(tam_album)
+
+
+    def convert(self, to: str = 'auto') -> Colecao:
+        '''
+        Retorna uma nova coleção com as mesmas figurinhas (e quantidades) desta, na representação
+        *to*. Com to='auto', a representação é escolhida pelo modelo de custo a partir da quantidade
+        atual de figurinhas distintas. As figurinhas são carregadas de uma só vez na nova coleção,
+        sem inserções individuais; esta coleção não é alterada.
+
+        Exemplos:
+        >>> c = Colecao.create(1000, backend='esparsa')
+        >>> c.insere_muitos([5, 5, 7, 900])
+        >>> d = c.convert(to='bitset')
+        >>> type(d).__module__
+        'colecao_bitset'
+        >>> d.visualizar(), d.repetidas()
+        ('[5, 7, 900]', '[5 (1)]')
+        >>> type(d.convert(to='no').convert(to='arranjo')).__module__
+        'colecao_arranjo'
+        >>> c.insere_muitos(range(1, 1001))
+        >>> e = c.convert()
+        >>> type(e).__module__
+        'colecao_arranjo'
+        >>> e.repetidas()
+        '[5 (2), 7 (1), 900 (1)]'
+        '''
+        quantidades = list(self.itera_quantidades())
+        if to == 'auto':
+            to = escolhe_backend(self.tam_album, len(quantidades))
+        nova = Colecao.create(self.tam_album, backend=to)
+        nova._carrega(quantidades)
+        return nova
+
+
+    def itera_quantidades(self) -> Iterator[tuple[int, int]]:
+        '''
+        Itera, em ordem crescente, sobre os pares (figurinha, quantidade) das figurinhas da coleção.
+
+        Exemplos:
+        >>> c = Colecao.create(100, backend='arranjo')
+        >>> c.insere_muitos([4, 2, 4])
+        >>> list(c.itera_quantidades())
+        [(2, 1), (4, 2)]
+        '''
+        repetidas = dict(self.itera_repetidas())
+        for fig in self.itera_possuidas():
+            yield fig, 1 + repetidas.get(fig, 0)
+
+
+    def distintas(self) -> int:
+        '''
+        Retorna a quantidade de figurinhas distintas da coleção, em tempo constante (as
+        representações mantêm os contadores n_distintas e n_repetidas a cada alteração).
+
+        Exemplos:
+        >>> for backend in BACKENDS:
+        ...     c1, c2 = Colecao.create(10, backend), Colecao.create(10, backend)
+        ...     c1.insere_muitos([1, 1, 1, 2, 3])
+        ...     c2.insere_muitos([4, 4, 5])
+        ...     c1.troca(c2)
+        ...     c2.remove(5)
+        ...     print(backend, c1.distintas(), c1.total_repetidas(), c1.faltantes(), c2.distintas())
+        arranjo 4 1 6 2
+        no 4 1 6 2
+        esparsa 4 1 6 2
+        bitset 4 1 6 2
+        '''
+        return self.n_distintas
+
+
+    def total_repetidas(self) -> int:
+        '''
+        Retorna o total de figurinhas repetidas da coleção (a soma das quantidades em excesso
+        mostradas por *repetidas*), em tempo constante.
+        '''
+        return self.n_repetidas
+
+
+    def faltantes(self) -> int:
+        '''
+        Retorna quantas figurinhas do álbum faltam na coleção, em tempo constante.
+        '''
+        return self.tam_album - self.n_distintas
+
+
+    def dump(self, fp: BinaryIO) -> None:
+        '''
+        Grava a coleção no arquivo binário *fp* em um instantâneo compacto (veja colecao_arquivo),
+        com o tamanho do álbum e as figurinhas e quantidades codificadas por diferença em varints.
+        Várias coleções podem ser gravadas em sequência no mesmo arquivo.
+
+        Exemplos:
+        >>> import io
+        >>> c = Colecao.create(1000, backend='no')
+        >>> c.insere_muitos([10, 10, 12, 999])
+        >>> fp = io.BytesIO()
+        >>> c.dump(fp)
+        >>> Colecao.create(5).dump(fp)
+        >>> len(fp.getvalue())
+        22
+        '''
+        fp.write(colecao_arquivo.codifica(self.tam_album, self.itera_quantidades()))
+
+
+    @staticmethod
+    def load(fp: BinaryIO, backend: str = 'auto') -> Colecao:
+        '''
+        Lê de *fp* uma coleção gravada por *dump*, na representação *backend* (com 'auto', escolhida
+        pelo modelo de custo a partir do número de figurinhas distintas gravado no cabeçalho).
+
+        Exemplos:
+        >>> import io
+        >>> c = Colecao.create(1000, backend='arranjo')
+        >>> c.insere_muitos([10, 10, 12, 999])
+        >>> fp = io.BytesIO()
+        >>> c.dump(fp)
+        >>> _ = fp.seek(0)
+        >>> d = Colecao.load(fp)
+        >>> type(d).__module__, d.visualizar(), d.repetidas()
+        ('colecao_bitset', '[10, 12, 999]', '[10 (1)]')
+        >>> Colecao.load(io.BytesIO(b'XYZ'))
+        Traceback (most recent call last):
+        ...
+        ValueError: arquivo não é um instantâneo de coleção
+        >>> Colecao.load(io.BytesIO(colecao_arquivo.codifica(10, [(0, 1)])), backend='arranjo')
+        Traceback (most recent call last):
+        ...
+        ValueError: instantâneo inválido
+        >>> corrompido = bytearray(colecao_arquivo.codifica(10, [(2, 1)]))
+        >>> corrompido[5] = 3 # distintas no cabeçalho
+        >>> Colecao.load(io.BytesIO(corrompido))
+        Traceback (most recent call last):
+        ...
+        ValueError: instantâneo inválido
+        '''
+        tam_album, distintas, tamanho = colecao_arquivo.le_cabecalho(fp)
+        corpo = fp.read(tamanho)
+        if len(corpo) < tamanho:
+            raise ValueError('instantâneo incompleto')
+        nova = Colecao.create(tam_album, backend=backend, distintas_esperadas=distintas)
+        nova._carrega(colecao_arquivo.decodifica(corpo, 0, tamanho, tam_album))
+        if nova.distintas() != distintas:
+            raise ValueError('instantâneo inválido')
+        return nova
+
+
+    def _carrega(self, quantidades: Iterable[tuple[int, int]]) -> None:
+        '''
+        Carrega em uma coleção vazia os pares (figurinha, quantidade) de *quantidades*, em ordem
+        crescente de figurinha. As representações substituem esta versão genérica por uma que
+        monta a estrutura diretamente.
+        '''
+        self.insere_muitos(fig for fig, qtd in quantidades for _ in range(qtd))
+
+
+    def _troca_generica(self, colecionador: Colecao, simular: bool = False) -> RelatorioTroca:
+        '''
+        Realiza a mesma troca de *troca* entre coleções de representações diferentes (por exemplo,
+        escolhidas automaticamente por *create* ou *load*), usando apenas *itera_possuidas*,
+        *itera_repetidas*, *insere* e *remove*. Retorna um relatório com os pares trocados; se
+        *simular* é True, as coleções não são alteradas.
+
+        Exemplos:
+        >>> c1 = Colecao.create(1000, backend='arranjo')
+        >>> c2 = Colecao.create(1000, backend='esparsa')
+        >>> c1.insere_muitos([1, 2, 4, 4, 6, 6])
+        >>> c2.insere_muitos([5, 5, 10, 10, 10])
+        >>> c1.troca(c2)
+        >>> c1.visualizar(), c2.visualizar(), c2.repetidas()
+        ('[1, 2, 4, 5, 6, 10]', '[4, 5, 6, 10]', '[10 (1)]')
+        >>> c2.troca(Colecao.create(500, backend='bitset'))
+        Traceback (most recent call last):
+        ...
+        ValueError: os álbuns não possuem o mesmo tamanho (diferentes)
+        '''
+        if self.tam_album != colecionador.tam_album:
+            raise ValueError('os álbuns não possuem o mesmo tamanho (diferentes)')
+
+        possuidas1 = set(self.itera_possuidas())
+        possuidas2 = set(colecionador.itera_possuidas())
+        # figurinhas que self pode receber: faltam em self e são repetidas em colecionador
+        trocaveis1 = [fig for fig, _ in colecionador.itera_repetidas() if fig not in possuidas1]
+        # figurinhas que colecionador pode receber: são repetidas em self e faltam em colecionador
+        trocaveis2 = [fig for fig, _ in self.itera_repetidas() if fig not in possuidas2]
+
+        pares = list(zip(trocaveis1, trocaveis2))
+        if not simular:
+            for fig1, fig2 in pares:
+                self.remove(fig2)
+                self.insere(fig1)
+                colecionador.remove(fig1)
+                colecionador.insere(fig2)
+        return RelatorioTroca(pares)
@@ -1,7 +1,25 @@
-from typing import TypeVar, Iterator, Generic, overload, Union, Tuple
+from typing import TypeVar, Iterator, Iterable, Generic, overload, Union, Tuple, Callable, Any
+from functools import partial
+from itertools import compress
+import array as _array
+import mmap
+import operator
+import os
+import struct
 
 T = TypeVar('T')
 
+# Para cada operador, a função f tal que f(val, x) equivale a "x <op> val".
+# Assim partial(f, val) pode ser aplicada com map diretamente aos elementos.
+_COMPARACOES: dict[str, Callable[[Any, Any], bool]] = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.gt,
+    '<=': operator.ge,
+    '>': operator.lt,
+    '>=': operator.le,
+}
+
 
 class array(Generic[T]):
     '''
@@ -34,17 +52,37 @@ class array(Generic[T]):
     ...    s = s + v
     >>> s
     'oi de novo oi'
+
+    Exemplo com armazenamento tipado
+    Quando *typecode* é informado, os valores são guardados de forma compacta
+    em um arranjo do módulo array da biblioteca padrão (acessado por um
+    memoryview), usando apenas o tamanho do tipo em cada posição.
+    >>> a = array(4, 0, typecode='i')
+    >>> a
+    array([0, 0, 0, 0], typecode='i')
+    >>> a[2] = 7
+    >>> a[2]
+    7
+    >>> list(a)
+    [0, 0, 7, 0]
+    >>> a.buffer().nbytes
+    16
+    >>> a[0] = 'oi'
+    Traceback (most recent call last):
+    ...
+    TypeError: memoryview: invalid type for format 'i'
     '''
 
-    valores: list[T]
+    valores: list[T] | memoryview
+    typecode: str | None
 
     @overload
-    def __init__(self, n_values: list[T]) -> None: ...
+    def __init__(self, n_values: list[T], *, typecode: str | None = None) -> None: ...
 
     @overload
-    def __init__(self, n_values: int, val: T) -> None: ...
+    def __init__(self, n_values: int, val: T, typecode: str | None = None) -> None: ...
 
-    def __init__(self, n_values: int | list[T], val: T | None = None) -> None:
+    def __init__(self, n_values: int | list[T], val: T | None = None, typecode: str | None = None) -> None:
         '''
         Cria um novo arranjo com *n* cópias de *val*.
 
@@ -81,61 +119,657 @@ class array(Generic[T]):
         >>> pontos[0].x = 10
         >>> pontos
         array([Ponto(x=10, y=4), Ponto(x=3, y=4)])
+
+        Com *typecode* (um dos códigos do módulo array, como 'i', 'q' ou 'd')
+        os valores são armazenados sem objetos Python individuais.
+        >>> array([1, 2, 3], typecode='q')
+        array([1, 2, 3], typecode='q')
         '''
+        self.typecode = typecode
         if isinstance(n_values, int):
             assert val is not None
-            self.valores = [val] * n_values
+            if typecode is None:
+                self.valores = [val] * n_values
+            else:
+                self.valores = memoryview(_array.array(typecode, [val]) * n_values)
         else:
             assert val is None
-            self.valores = n_values[:]
+            if typecode is None:
+                self.valores = n_values[:]
+            else:
+                self.valores = memoryview(_array.array(typecode, n_values))
+
+    def buffer(self) -> memoryview:
+        '''
+        Retorna um memoryview com os valores do arranjo, sem copiá-los. Alterações
+        feitas no memoryview são vistas pelo arranjo e vice-versa. Requer que o
+        arranjo tenha sido criado com *typecode*.
+
+        Exemplo
+        >>> a = array(3, 0, typecode='i')
+        >>> m = a.buffer()
+        >>> m[1] = 5
+        >>> a
+        array([0, 5, 0], typecode='i')
+        >>> array(3, 0).buffer()
+        Traceback (most recent call last):
+        ...
+        ValueError: arranjo sem typecode não possui buffer
+        '''
+        if self.typecode is None:
+            raise ValueError('arranjo sem typecode não possui buffer')
+        assert isinstance(self.valores, memoryview)
+        return self.valores
 
     def __len__(self) -> int:
         return len(self.valores)
 
-    def __getitem__(self, i: int) -> T:
+    @overload
+    def __getitem__(self, i: int) -> T: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> 'array[T]': ...
+
+    def __getitem__(self, i: int | slice) -> 'T | array[T]':
+        '''
+        Retorna o elemento na posição *i* ou, se *i* é uma fatia, um arranjo
+        com os elementos da fatia. Em arranjos com *typecode* a fatia é uma
+        visão (sem cópia) dos mesmos valores; sem *typecode* ela é uma cópia.
+
+        Exemplos
+        >>> a = array([1, 2, 3, 4, 5], typecode='i')
+        >>> v = a[1:4]
+        >>> v
+        array([2, 3, 4], typecode='i')
+        >>> v[0] = 20
+        >>> a
+        array([1, 20, 3, 4, 5], typecode='i')
+        >>> b = array([1, 2, 3])
+        >>> c = b[::2]
+        >>> c[0] = 10
+        >>> b, c
+        (array([1, 2, 3]), array([10, 3]))
+        '''
+        if isinstance(i, slice):
+            return array._de_valores(self.valores[i], self.typecode)
         return self.valores[i]
 
-    def __setitem__(self, i: int, value: T):
-        self.valores[i] = value
+    def __setitem__(self, i: int | slice, value):
+        '''
+        Altera o elemento na posição *i*. Se *i* é uma fatia, *value* deve ser
+        um iterável com a mesma quantidade de elementos da fatia (o tamanho do
+        arranjo não muda).
+
+        Exemplos
+        >>> a = array(5, 0, typecode='i')
+        >>> a[1:3] = [7, 8]
+        >>> a
+        array([0, 7, 8, 0, 0], typecode='i')
+        >>> b = array(4, 'x')
+        >>> b[::2] = array(['a', 'b'])
+        >>> b
+        array(['a', 'x', 'b', 'x'])
+        >>> b[0:2] = ['z']
+        Traceback (most recent call last):
+        ...
+        ValueError: a fatia possui 2 elementos mas foram dados 1
+        '''
+        if isinstance(i, slice):
+            n = len(range(*i.indices(len(self.valores))))
+            if self.typecode is None:
+                novos: Any = list(value)
+            else:
+                novos = _array.array(self.typecode, value)
+            if len(novos) != n:
+                raise ValueError(f'a fatia possui {n} elementos mas foram dados {len(novos)}')
+            self.valores[i] = novos
+        else:
+            self.valores[i] = value
+
+    def fill(self, value: T, start: int = 0, stop: int | None = None) -> None:
+        '''
+        Atribui *value* a todas as posições de *start* (inclusive) até *stop*
+        (exclusive; o final do arranjo se for None).
+
+        Exemplos
+        >>> a = array(6, 0, typecode='i')
+        >>> a.fill(3, 2, 5)
+        >>> a
+        array([0, 0, 3, 3, 3, 0], typecode='i')
+        >>> b = array(3, 'a')
+        >>> b.fill('b')
+        >>> b
+        array(['b', 'b', 'b'])
+        '''
+        start, stop, _ = slice(start, stop).indices(len(self.valores))
+        n = max(0, stop - start)
+        if self.typecode is None:
+            self.valores[start:stop] = [value] * n
+        else:
+            self.valores[start:stop] = _array.array(self.typecode, [value]) * n
+
+    def mask(self, op: str, value: T, start: int = 0, stop: int | None = None) -> 'array[int]':
+        '''
+        Retorna um arranjo tipado ('B') com 1 nas posições entre *start* e *stop*
+        cujo elemento x satisfaz "x *op* *value*" e 0 nas demais. *op* é um
+        dos operadores '==', '!=', '<', '<=', '>' ou '>='.
+
+        Exemplos
+        >>> a = array([0, 3, 1, 0, 5], typecode='i')
+        >>> a.mask('>', 0)
+        array([0, 1, 1, 0, 1], typecode='B')
+        >>> a.mask('==', 0, 1)
+        array([0, 0, 1, 0], typecode='B')
+        >>> a.mask('=>', 0)
+        Traceback (most recent call last):
+        ...
+        ValueError: operador inválido: '=>'
+        '''
+        return array._de_valores(memoryview(_array.array('B', self._compara(op, value, start, stop))), 'B')
+
+    def count_where(self, op: str, value: T, start: int = 0, stop: int | None = None) -> int:
+        '''
+        Retorna a quantidade de elementos x entre *start* e *stop* que satisfazem
+        "x *op* *value*" (veja *mask*).
+
+        Exemplos
+        >>> a = array([0, 3, 1, 0, 5], typecode='i')
+        >>> a.count_where('>', 0)
+        3
+        >>> a.count_where('>=', 3, 2)
+        1
+        '''
+        return sum(self._compara(op, value, start, stop))
+
+    def nonzero(self, start: int = 0, stop: int | None = None) -> list[int]:
+        '''
+        Retorna, em ordem crescente, os índices das posições entre *start* e
+        *stop* cujo elemento é verdadeiro (diferente de zero).
+
+        Exemplos
+        >>> a = array([0, 3, 1, 0, 5], typecode='i')
+        >>> a.nonzero()
+        [1, 2, 4]
+        >>> a.nonzero(2, 4)
+        [2]
+        >>> a.mask('>', 1).nonzero()
+        [1, 4]
+        '''
+        start, stop, _ = slice(start, stop).indices(len(self.valores))
+        return list(compress(range(start, stop), self.valores[start:stop]))
+
+    def indices_where(self, op: str, value: T, start: int = 0, stop: int | None = None) -> list[int]:
+        '''
+        Retorna, em ordem crescente, os índices das posições entre *start* e
+        *stop* cujo elemento x satisfaz "x *op* *value*" (veja *mask*). O
+        resultado é o mesmo de mask(op, value, start, stop).nonzero(), somado a
+        *start*, mas obtido em uma única passada e sem criar a máscara.
+
+        Exemplos
+        >>> a = array([0, 3, 1, 0, 5], typecode='i')
+        >>> a.indices_where('>', 1)
+        [1, 4]
+        >>> a.indices_where('==', 0, 1)
+        [3]
+        '''
+        start, stop, _ = slice(start, stop).indices(len(self.valores))
+        return list(compress(range(start, stop), self._compara(op, value, start, stop)))
+
+    def add(self, value: T, start: int = 0, stop: int | None = None) -> None:
+        '''
+        Soma *value* a cada elemento entre *start* e *stop*.
+
+        Exemplos
+        >>> a = array(5, 1, typecode='i')
+        >>> a.add(2, 1, 3)
+        >>> a
+        array([1, 3, 3, 1, 1], typecode='i')
+        >>> a.add(-1)
+        >>> a
+        array([0, 2, 2, 0, 0], typecode='i')
+        '''
+        self._aplica(partial(operator.add, value), start, stop)
+
+    def mul(self, value: T, start: int = 0, stop: int | None = None) -> None:
+        '''
+        Multiplica por *value* cada elemento entre *start* e *stop*.
+
+        Exemplos
+        >>> a = array([1, 2, 3, 4], typecode='i')
+        >>> a.mul(10, 2)
+        >>> a
+        array([1, 2, 30, 40], typecode='i')
+        '''
+        self._aplica(partial(operator.mul, value), start, stop)
+
+    def _compara(self, op: str, value: T, start: int, stop: int | None) -> Iterator[bool]:
+        if op not in _COMPARACOES:
+            raise ValueError(f'operador inválido: {op!r}')
+        return map(partial(_COMPARACOES[op], value), self.valores[start:stop])
+
+    def _aplica(self, f: Callable[[T], T], start: int, stop: int | None) -> None:
+        if self.typecode is None:
+            self.valores[start:stop] = list(map(f, self.valores[start:stop]))
+        else:
+            self.valores[start:stop] = _array.array(self.typecode, map(f, self.valores[start:stop]))
+
+    @staticmethod
+    def _de_valores(valores: 'list[T] | memoryview', typecode: str | None) -> 'array[T]':
+        '''
+        Cria um arranjo que usa diretamente *valores* (sem cópia).
+        '''
+        a: array[T] = array.__new__(array)
+        a.valores = valores
+        a.typecode = typecode
+        return a
 
     def __iter__(self) -> Iterator[T]:
         return iter(self.valores)
 
     def __repr__(self) -> str:
-        return 'array(' + repr(self.valores) + ')'
+        if self.typecode is None:
+            return 'array(' + repr(self.valores) + ')'
+        return 'array(' + repr(self.valores.tolist()) + ', typecode=' + repr(self.typecode) + ')'
+
+    def __str__(self) -> str:
+        if self.typecode is None:
+            return 'array(' + str(self.valores) + ')'
+        return repr(self)
+
+
+class dynarray(Generic[T]):
+    '''
+    Um arranjo que cresce conforme os elementos são adicionados ao final.
+
+    Os elementos ficam em um *array* com capacidade possivelmente maior que o
+    número de elementos. Quando a capacidade acaba, um novo *array* com a
+    capacidade multiplicada por *growth* é alocado e os elementos são copiados,
+    de modo que *append* tem custo amortizado O(1). Os atributos *realocacoes*
+    e *bytes_copiados* contam as realocações feitas e o total de bytes copiados
+    nelas.
+
+    Exemplos
+    >>> d = dynarray(typecode='i')
+    >>> for i in range(5):
+    ...     d.append(i * 10)
+    >>> d
+    dynarray([0, 10, 20, 30, 40], typecode='i')
+    >>> len(d), d.capacity()
+    (5, 8)
+    >>> d.realocacoes, d.bytes_copiados
+    (4, 28)
+    >>> d[2]
+    20
+    >>> d[5]
+    Traceback (most recent call last):
+    ...
+    IndexError: índice fora do arranjo
+    >>> d.pop()
+    40
+    >>> d.shrink_to_fit()
+    >>> d.capacity()
+    4
+
+    Sem *typecode* qualquer valor pode ser armazenado
+    >>> d = dynarray(growth=1.5)
+    >>> d.reserve(3)
+    >>> d.append('a')
+    >>> d.append('b')
+    >>> list(d), d.realocacoes
+    (['a', 'b'], 1)
+    '''
+
+    dados: array[T]
+    n: int
+    growth: float
+    typecode: str | None
+    realocacoes: int
+    bytes_copiados: int
+
+    def __init__(self, typecode: str | None = None, growth: float = 2.0) -> None:
+        '''
+        Cria um arranjo dinâmico vazio. *typecode* tem o mesmo significado que
+        em *array*. *growth* é o fator de crescimento da capacidade e deve ser
+        maior que 1.
+
+        Exemplo
+        >>> dynarray(growth=1)
+        Traceback (most recent call last):
+        ...
+        ValueError: o fator de crescimento deve ser maior que 1
+        '''
+        if growth <= 1:
+            raise ValueError('o fator de crescimento deve ser maior que 1')
+        self.typecode = typecode
+        self.growth = growth
+        self.n = 0
+        self.realocacoes = 0
+        self.bytes_copiados = 0
+        self.dados = self._aloca(0)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, i: int) -> T:
+        if not -self.n <= i < self.n:
+            raise IndexError('índice fora do arranjo')
+        return self.dados[i % self.n]
+
+    def __setitem__(self, i: int, value: T):
+        if not -self.n <= i < self.n:
+            raise IndexError('índice fora do arranjo')
+        self.dados[i % self.n] = value
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.dados[0:self.n])
+
+    def capacity(self) -> int:
+        '''
+        Retorna a quantidade de elementos que cabem no arranjo sem realocação.
+        '''
+        return len(self.dados)
+
+    def append(self, value: T) -> None:
+        '''
+        Adiciona *value* ao final do arranjo.
+        '''
+        if self.n == len(self.dados):
+            self._realoca(max(self.n + 1, int(self.n * self.growth)))
+        self.dados[self.n] = value
+        self.n += 1
+
+    def pop(self) -> T:
+        '''
+        Remove e retorna o último elemento do arranjo. A capacidade não muda;
+        sem *typecode*, a posição liberada deixa de referenciar o elemento.
+
+        Exemplo
+        >>> dynarray().pop()
+        Traceback (most recent call last):
+        ...
+        IndexError: arranjo vazio
+        >>> d = dynarray()
+        >>> d.append('a')
+        >>> d.pop(), d.dados[0]
+        ('a', None)
+        '''
+        if self.n == 0:
+            raise IndexError('arranjo vazio')
+        self.n -= 1
+        valor = self.dados[self.n]
+        if self.typecode is None:
+            self.dados[self.n] = None  # type: ignore
+        return valor
+
+    def reserve(self, n: int) -> None:
+        '''
+        Garante que o arranjo tenha capacidade para pelo menos *n* elementos.
+        '''
+        if n > len(self.dados):
+            self._realoca(n)
+
+    def shrink_to_fit(self) -> None:
+        '''
+        Reduz a capacidade do arranjo para o número de elementos.
+        '''
+        if self.n < len(self.dados):
+            self._realoca(self.n)
+
+    def to_array(self) -> array[T]:
+        '''
+        Retorna um *array* com os elementos do arranjo. Com *typecode* o
+        resultado é uma visão dos elementos, válida até a próxima realocação.
+
+        Exemplo
+        >>> d = dynarray(typecode='i')
+        >>> d.append(3)
+        >>> d.to_array()
+        array([3], typecode='i')
+        '''
+        return self.dados[0:self.n]
+
+    def _aloca(self, capacidade: int) -> array[T]:
+        if self.typecode is None:
+            return array._de_valores([None] * capacidade, None)  # type: ignore
+        return array(capacidade, 0, self.typecode)  # type: ignore
+
+    def _realoca(self, capacidade: int) -> None:
+        novo = self._aloca(capacidade)
+        novo[0:self.n] = self.dados[0:self.n]
+        if self.typecode is None:
+            self.bytes_copiados += self.n * struct.calcsize('P')
+        else:
+            self.bytes_copiados += self.n * self.dados.buffer().itemsize
+        self.realocacoes += 1
+        self.dados = novo
+
+    def __repr__(self) -> str:
+        if self.typecode is None:
+            return 'dynarray(' + repr(list(self)) + ')'
+        return 'dynarray(' + repr(list(self)) + ', typecode=' + repr(self.typecode) + ')'
 
     def __str__(self) -> str:
-        return 'array(' + str(self.valores) + ')'
+        return repr(self)
+
+
+# Tabela que converte cada byte de uma máscara no caractere '0' (byte nulo) ou '1' (qualquer
+# outro valor).
+_BITS = bytes.maketrans(bytes(range(256)), b'0' + b'1' * 255)
+
+
+class bitset:
+    '''
+    Um conjunto de inteiros entre 0 e n - 1, representado com um bit por
+    elemento em um *array* de bytes (o elemento e é o bit e % 8 do byte e // 8).
+
+    As operações entre conjuntos (&, | e -) e a contagem de elementos são
+    feitas sobre todos os bits de uma vez, convertendo o buffer do arranjo
+    para um inteiro do Python, e a iteração pula os bytes nulos.
+
+    Exemplos
+    >>> a = bitset(100)
+    >>> a.add(3)
+    >>> a.add(70)
+    >>> a.add(99)
+    >>> 70 in a, 4 in a
+    (True, False)
+    >>> a.count()
+    3
+    >>> list(a)
+    [3, 70, 99]
+    >>> b = bitset.from_iterable(100, [3, 4, 5])
+    >>> list(a & b), list(a | b), list(b - a)
+    ([3], [3, 4, 5, 70, 99], [4, 5])
+    >>> a.discard(70)
+    >>> a
+    bitset(100, [3, 99])
+    >>> a.add(100)
+    Traceback (most recent call last):
+    ...
+    IndexError: elemento fora do conjunto
+    '''
+
+    n: int
+    blocos: array[int]
+
+    def __init__(self, n: int) -> None:
+        '''
+        Cria um conjunto vazio para os elementos 0, 1, ..., *n* - 1.
+        '''
+        self.n = n
+        self.blocos = array((n + 7) // 8, 0, typecode='B')
+
+    @staticmethod
+    def from_iterable(n: int, elementos: Iterable[int]) -> 'bitset':
+        '''
+        Cria um conjunto para os elementos 0, ..., *n* - 1 contendo *elementos*.
+        '''
+        b = bitset(n)
+        for e in elementos:
+            b.add(e)
+        return b
+
+    @staticmethod
+    def from_mask(mask: Iterable[Any], n: int | None = None, offset: int = 0) -> 'bitset':
+        '''
+        Cria um conjunto com os índices (somados a *offset*) das posições
+        verdadeiras de *mask*, como a máscara retornada por *array.mask*. O
+        conjunto tem *n* elementos possíveis, ou len(mask) + *offset* se *n*
+        for None.
+
+        Exemplo
+        >>> a = array([0, 2, 0, 1], typecode='i')
+        >>> bitset.from_mask(a.mask('>', 0))
+        bitset(4, [1, 3])
+        >>> bitset.from_mask([True, False, True], offset=1)
+        bitset(4, [1, 3])
+        >>> bitset.from_mask(array([0, 2, 1], typecode='B'))
+        bitset(3, [1, 2])
+        '''
+        if isinstance(mask, array) and mask.typecode == 'B':
+            bits = mask.buffer().tobytes()
+        else:
+            bits = bytes(map(bool, mask))
+        if n is None:
+            n = len(bits) + offset
+        b = bitset(n)
+        if bits:
+            b._set_int(int(bits.translate(_BITS)[::-1], 2) << offset)
+        return b
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __contains__(self, e: int) -> bool:
+        return 0 <= e < self.n and (self.blocos[e >> 3] >> (e & 7)) & 1 == 1
+
+    def add(self, e: int) -> None:
+        '''
+        Adiciona *e* ao conjunto.
+        '''
+        if not 0 <= e < self.n:
+            raise IndexError('elemento fora do conjunto')
+        self.blocos[e >> 3] |= 1 << (e & 7)
+
+    def discard(self, e: int) -> None:
+        '''
+        Remove *e* do conjunto, se ele pertencer ao conjunto.
+        '''
+        if e in self:
+            self.blocos[e >> 3] ^= 1 << (e & 7)
+
+    def count(self) -> int:
+        '''
+        Retorna a quantidade de elementos do conjunto.
+        '''
+        return self._int().bit_count()
+
+    def __iter__(self) -> Iterator[int]:
+        '''
+        Itera sobre os elementos do conjunto em ordem crescente.
+        '''
+        for i in self.blocos.nonzero():
+            w = self.blocos[i]
+            base = i << 3
+            while w:
+                menor = w & -w
+                yield base + menor.bit_length() - 1
+                w ^= menor
+
+    def __and__(self, outro: 'bitset') -> 'bitset':
+        return self._combina(outro, self._int() & outro._int())
+
+    def __or__(self, outro: 'bitset') -> 'bitset':
+        return self._combina(outro, self._int() | outro._int())
+
+    def __sub__(self, outro: 'bitset') -> 'bitset':
+        return self._combina(outro, self._int() & ~outro._int())
+
+    def __eq__(self, outro: object) -> bool:
+        return isinstance(outro, bitset) and self.n == outro.n and self._int() == outro._int()
+
+    def _combina(self, outro: 'bitset', x: int) -> 'bitset':
+        if self.n != outro.n:
+            raise ValueError('os conjuntos possuem tamanhos diferentes')
+        b = bitset(self.n)
+        b._set_int(x)
+        return b
+
+    def _int(self) -> int:
+        return int.from_bytes(self.blocos.buffer(), 'little')
+
+    def _set_int(self, x: int) -> None:
+        buf = self.blocos.buffer()
+        buf[:] = x.to_bytes(len(buf), 'little')
+
+    def __repr__(self) -> str:
+        return 'bitset(' + str(self.n) + ', ' + repr(list(self)) + ')'
+
+    def __str__(self) -> str:
+        return repr(self)
 
 
 class array2d(Generic[T]):
+    '''
+    Um arranjo bidimensional de tamanho fixo, armazenado linha a linha em um
+    único arranjo.
+
+    Exemplos
+    >>> m = array2d(2, 3, 0)
+    >>> m[1, 2] = 5
+    >>> m
+    array2d([[0, 0, 0]
+             [0, 0, 5]])
+    >>> m[1, 2]
+    5
+
+    Com *typecode* os valores são armazenados de forma compacta e as linhas e
+    colunas podem ser obtidas como visões, sem cópia.
+    >>> m = array2d(3, 3, 0, typecode='i')
+    >>> col = m.coluna(1)
+    >>> col.fill(7)
+    >>> m
+    array2d([[0, 7, 0]
+             [0, 7, 0]
+             [0, 7, 0]], typecode='i')
+    >>> m.linha(2)[0] = 4
+    >>> m.get(2, 0)
+    4
+    '''
+
     lins: int
     cols: int
-    valores: list[T]
+    valores: list[T] | memoryview
+    typecode: str | None
+    _mmap: mmap.mmap | None
 
     @overload
-    def __init__(self, lins_values: list[list[T]]): ...
+    def __init__(self, lins_values: list[list[T]], *, typecode: str | None = None): ...
 
     @overload
-    def __init__(self, lins_values: int, cols: int, val: T): ...
+    def __init__(self, lins_values: int, cols: int, val: T, typecode: str | None = None): ...
 
-    def __init__(self, lins_values: int | list[list[T]], cols: int | None = None, val: T | None = None):
+    def __init__(self, lins_values: int | list[list[T]], cols: int | None = None, val: T | None = None,
+                 typecode: str | None = None):
+        self.typecode = typecode
+        self._mmap = None
         if isinstance(lins_values, int):
             assert cols is not None
             assert val is not None
             self.lins = lins_values
             self.cols = cols
-            self.valores = [val] * (self.lins * self.cols)
+            self.valores = array(self.lins * self.cols, val, typecode).valores
         else:
             assert cols is None
             assert val is None
             self.lins = len(lins_values)
             self.cols = len(lins_values[0])
-            self.valores = []
+            valores = []
             for lin in lins_values:
                 assert len(lin) == self.cols
                 for val in lin:
-                    self.valores.append(val)
+                    valores.append(val)
+            self.valores = array(valores, typecode=typecode).valores
 
     def __getitem__(self, index: Tuple[int, int]) -> T:
         lin, col = index
@@ -149,13 +783,140 @@ class array2d(Generic[T]):
         assert col < self.cols
         self.valores[lin * self.cols + col] = value
 
+    def get(self, lin: int, col: int) -> T:
+        '''
+        Retorna o elemento na posição (*lin*, *col*) sem verificar os limites
+        de cada dimensão (apenas o do arranjo todo). Para uso em laços onde os
+        índices já são sabidamente válidos.
+        '''
+        return self.valores[lin * self.cols + col]
+
+    def set(self, lin: int, col: int, value: T) -> None:
+        '''
+        Altera o elemento na posição (*lin*, *col*) sem verificar os limites de
+        cada dimensão (veja *get*).
+        '''
+        self.valores[lin * self.cols + col] = value
+
+    def linha(self, lin: int) -> array[T]:
+        '''
+        Retorna a linha *lin* como um arranjo. Com *typecode* o arranjo é uma
+        visão dos valores da matriz; sem *typecode* é uma cópia.
+
+        Exemplo
+        >>> m = array2d([[1, 2], [3, 4]], typecode='i')
+        >>> m.linha(1)
+        array([3, 4], typecode='i')
+        '''
+        assert 0 <= lin < self.lins
+        i = lin * self.cols
+        return array._de_valores(self.valores[i:(i + self.cols)], self.typecode)
+
+    def coluna(self, col: int) -> array[T]:
+        '''
+        Retorna a coluna *col* como um arranjo. Com *typecode* o arranjo é uma
+        visão dos valores da matriz; sem *typecode* é uma cópia.
+
+        Exemplo
+        >>> m = array2d([[1, 2], [3, 4]])
+        >>> m.coluna(0)
+        array([1, 3])
+        '''
+        assert 0 <= col < self.cols
+        return array._de_valores(self.valores[col::self.cols], self.typecode)
+
+    def to_file(self, caminho: str) -> None:
+        '''
+        Grava os valores da matriz em *caminho* no formato binário nativo do
+        *typecode*, linha a linha. Requer que a matriz tenha *typecode*.
+        '''
+        if self.typecode is None:
+            raise ValueError('arranjo sem typecode não pode ser gravado')
+        with open(caminho, 'wb') as f:
+            f.write(self.valores)
+
+    @staticmethod
+    def from_file(caminho: str, cols: int, typecode: str, writable: bool = False) -> 'array2d':
+        '''
+        Abre a matriz gravada em *caminho* por *to_file*, com *cols* colunas,
+        mapeando o arquivo em memória com mmap, de modo que os valores são
+        lidos sob demanda e não carregados de uma vez. Se *writable* é True, as
+        alterações na matriz são gravadas no arquivo; caso contrário a matriz
+        é somente leitura. Use *close* quando não precisar mais da matriz.
+
+        Exemplo
+        >>> import os, tempfile
+        >>> caminho = os.path.join(tempfile.mkdtemp(), 'm.bin')
+        >>> array2d([[1, 2, 3], [4, 5, 6]], typecode='i').to_file(caminho)
+        >>> m = array2d.from_file(caminho, 3, 'i')
+        >>> m
+        array2d([[1, 2, 3]
+                 [4, 5, 6]], typecode='i')
+        >>> m[1, 0] = 0
+        Traceback (most recent call last):
+        ...
+        TypeError: cannot modify read-only memory
+        >>> m.close()
+        >>> m = array2d.from_file(caminho, 3, 'i', writable=True)
+        >>> m.coluna(2).fill(0)
+        >>> m.close()
+        >>> array2d.from_file(caminho, 3, 'i').linha(1)
+        array([4, 5, 0], typecode='i')
+        >>> with open(caminho, 'ab') as f:
+        ...     _ = f.write(b'xy')
+        >>> array2d.from_file(caminho, 3, 'i')
+        Traceback (most recent call last):
+        ...
+        ValueError: o tamanho do arquivo não é múltiplo do tamanho de uma linha
+        >>> array2d.from_file(caminho, 0, 'i')
+        Traceback (most recent call last):
+        ...
+        ValueError: o número de colunas deve ser positivo
+        '''
+        if cols < 1:
+            raise ValueError('o número de colunas deve ser positivo')
+        with open(caminho, 'r+b' if writable else 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError('arquivo vazio')
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        try:
+            valores = memoryview(mm).cast(typecode)
+        except TypeError:
+            mm.close()
+            raise ValueError('o tamanho do arquivo não é múltiplo do tamanho de uma linha') from None
+        if len(valores) % cols != 0:
+            valores.release()
+            mm.close()
+            raise ValueError('o tamanho do arquivo não é múltiplo do tamanho de uma linha')
+        m: array2d = array2d.__new__(array2d)
+        m.lins = len(valores) // cols
+        m.cols = cols
+        m.valores = valores
+        m.typecode = typecode
+        m._mmap = mm
+        return m
+
+    def close(self) -> None:
+        '''
+        Libera o arquivo mapeado por *from_file*. Nenhuma visão da matriz pode
+        estar em uso. Não faz nada para matrizes que não vieram de arquivo.
+        '''
+        if self._mmap is not None:
+            assert isinstance(self.valores, memoryview)
+            self.valores.release()
+            self._mmap.close()
+            self._mmap = None
+
     def __repr__(self) -> str:
         s = 'array2d(['
         sep = ''
         for lin in range(self.lins):
             i = lin * self.cols
-            s += sep + repr(self.valores[i:(i + self.cols)])
+            linha = self.valores[i:(i + self.cols)]
+            s += sep + repr(linha if self.typecode is None else linha.tolist())
             sep = '\n' + ' ' * 9
+        if self.typecode is not None:
+            return s + '], typecode=' + repr(self.typecode) + ')'
         return s + '])'
 
     def __str__(self) -> str:
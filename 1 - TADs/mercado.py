@@ -0,0 +1,360 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+# Estado de um colecionador usado no planejamento: figurinhas possuídas e quantidade em
+# excesso de cada figurinha repetida.
+Estado = tuple[set[int], dict[int, int]]
+
+
+@dataclass
+class Troca:
+    '''
+    Uma troca entre os colecionadores de índices *col1* e *col2*: *col1* recebe *fig1* de *col2*
+    e *col2* recebe *fig2* de *col1*.
+    '''
+    col1: int
+    col2: int
+    fig1: int
+    fig2: int
+
+
+
+def mercado(colecoes: list[Any], particoes: int = 1, processos: int | None = None) -> list[Troca]:
+    '''
+    Planeja (veja *planeja_trocas*) e realiza trocas entre todas as *colecoes*, retornando as
+    trocas realizadas.
+
+    Exemplos:
+    >>> from colecao_arranjo import Colecao
+    >>> c1, c2, c3 = Colecao(10), Colecao(10), Colecao(10)
+    >>> for fig in [1, 1, 2]:
+    ...     c1.insere(fig)
+    >>> for fig in [3, 3, 4, 4]:
+    ...     c2.insere(fig)
+    >>> for fig in [2, 5, 5]:
+    ...     c3.insere(fig)
+    >>> mercado([c1, c2, c3])
+    [Troca(col1=0, col2=1, fig1=3, fig2=1), Troca(col1=1, col2=2, fig1=5, fig2=4)]
+    >>> c1.visualizar(), c2.visualizar(), c3.visualizar()
+    ('[1, 2, 3]', '[1, 3, 4, 5]', '[2, 4, 5]')
+    '''
+    trocas = planeja_trocas(colecoes, particoes, processos)
+    realiza_trocas(colecoes, trocas)
+    return trocas
+
+
+
+def planeja_trocas(colecoes: list[Any], particoes: int = 1, processos: int | None = None) -> list[Troca]:
+    '''
+    Calcula, sem alterar as coleções, um conjunto de trocas entre as *colecoes* (de mesmo tamanho
+    de álbum). Cada troca é feita entre dois colecionadores, um dando ao outro uma figurinha repetida
+    que o outro não possui, como em *troca*.
+
+    O planejamento é guloso: é construído um índice que associa cada figurinha aos colecionadores
+    que a possuem repetida; então, para cada colecionador e cada figurinha que lhe falta, procura-se
+    um doador que não possua alguma das repetidas do colecionador. As figurinhas sem doadores saem
+    do índice e cada doador incompatível é testado uma única vez por colecionador, de modo que o
+    custo cresce aproximadamente de forma linear com o número de colecionadores quando as trocas
+    são abundantes, sem comparar todos os pares de colecionadores. No pior caso (muitas figurinhas
+    disponíveis cujos doadores possuem todas as repetidas do colecionador), cada colecionador ainda
+    pode percorrer todo o índice.
+
+    O álbum pode ser dividido em *particoes* intervalos de figurinhas, com trocas apenas entre
+    figurinhas do mesmo intervalo. Os intervalos são independentes e, se *processos* não é None,
+    são planejados em paralelo por esse número de processos.
+
+    Exemplos:
+    >>> from colecao_esparsa import Colecao
+    >>> c1, c2 = Colecao(10), Colecao(10)
+    >>> for fig in [1, 1, 9, 9]:
+    ...     c1.insere(fig)
+    >>> for fig in [2, 2, 8, 8]:
+    ...     c2.insere(fig)
+    >>> planeja_trocas([c1, c2])
+    [Troca(col1=0, col2=1, fig1=2, fig2=1), Troca(col1=0, col2=1, fig1=8, fig2=9)]
+    >>> planeja_trocas([c1, c2], particoes=2, processos=2)
+    [Troca(col1=0, col2=1, fig1=2, fig2=1), Troca(col1=0, col2=1, fig1=8, fig2=9)]
+    >>> c1.visualizar()
+    '[1, 9]'
+    >>> planeja_trocas([c1, Colecao(20)])
+    Traceback (most recent call last):
+    ...
+    ValueError: os álbuns não possuem o mesmo tamanho (diferentes)
+    '''
+    if len(colecoes) == 0:
+        return []
+    tam_album = colecoes[0].tam_album
+    for c in colecoes:
+        if c.tam_album != tam_album:
+            raise ValueError('os álbuns não possuem o mesmo tamanho (diferentes)')
+
+    estados: list[Estado] = [(set(c.itera_possuidas()), dict(c.itera_repetidas())) for c in colecoes]
+    if particoes <= 1:
+        return _planeja(estados)
+
+    tam_particao = (tam_album + particoes - 1) // particoes
+    partes = [_restringe(estados, inicio, inicio + tam_particao)
+              for inicio in range(1, tam_album + 1, tam_particao)]
+    trocas: list[Troca] = []
+    if processos is None:
+        for parte in partes:
+            trocas.extend(_planeja(parte))
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            for trocas_parte in executor.map(_planeja, partes):
+                trocas.extend(trocas_parte)
+    return trocas
+
+
+
+def realiza_trocas(colecoes: list[Any], trocas: list[Troca]) -> None:
+    '''
+    Aplica às *colecoes* as *trocas* calculadas por *planeja_trocas*.
+    '''
+    for t in trocas:
+        c1 = colecoes[t.col1]
+        c2 = colecoes[t.col2]
+        c1.remove(t.fig2)
+        c1.insere(t.fig1)
+        c2.remove(t.fig1)
+        c2.insere(t.fig2)
+
+
+
+class Mercado:
+    '''
+    Um mercado de trocas entre as *colecoes* (de mesmo tamanho de álbum) usado repetidamente, por
+    exemplo a cada rodada de uma simulação. O estado do planejamento (figurinhas possuídas,
+    faltantes e repetidas de cada colecionador e o índice de doadores de cada figurinha) é mantido
+    entre as negociações, em vez de ser reconstruído a partir das coleções a cada vez; por isso
+    as figurinhas devem ser inseridas pelo *insere_muitos* do mercado.
+
+    Depois de uma negociação não resta nenhuma troca possível, pois as trocas só diminuem as
+    repetidas e aumentam as possuídas de cada colecionador. Assim, uma troca nova sempre usa uma
+    repetida obtida depois da última negociação, e *negocia* procura trocas apenas para os
+    colecionadores que ganharam repetidas. Colecionadores completos não podem receber figurinhas
+    e saem do índice de doadores.
+
+    Exemplos:
+    >>> from colecao_esparsa import Colecao
+    >>> m = Mercado([Colecao(10), Colecao(10), Colecao(10)])
+    >>> m.insere_muitos(0, [1, 1, 2])
+    >>> m.insere_muitos(1, [3, 3, 4, 4])
+    >>> m.insere_muitos(2, [2, 5, 5])
+    >>> m.negocia()
+    [Troca(col1=0, col2=1, fig1=3, fig2=1), Troca(col1=1, col2=2, fig1=5, fig2=4)]
+    >>> m.negocia()
+    []
+    >>> m.insere_muitos(0, [3])
+    >>> m.insere_muitos(2, [5])
+    >>> m.negocia()
+    [Troca(col1=0, col2=2, fig1=5, fig2=3)]
+    >>> [c.visualizar() for c in m.colecoes]
+    ['[1, 2, 3, 5]', '[1, 3, 4, 5]', '[2, 3, 4, 5]']
+    '''
+
+    colecoes: list[Any]
+    estados: list[Estado]
+    faltantes: list[set[int]]
+    doadores: dict[int, dict[int, None]]
+    alterados: dict[int, None]
+
+    def __init__(self, colecoes: list[Any]) -> None:
+        '''
+        Cria o mercado com o estado atual das *colecoes*, que a partir daqui devem receber
+        figurinhas apenas por *insere_muitos*.
+        '''
+        if colecoes:
+            tam_album = colecoes[0].tam_album
+            for c in colecoes:
+                if c.tam_album != tam_album:
+                    raise ValueError('os álbuns não possuem o mesmo tamanho (diferentes)')
+        self.colecoes = colecoes
+        self.estados = [(set(c.itera_possuidas()), dict(c.itera_repetidas())) for c in colecoes]
+        self.faltantes = [set(range(1, c.tam_album + 1)) - possui for c, (possui, _) in zip(colecoes, self.estados)]
+        # doadores[fig] contém os colecionadores incompletos que têm fig repetida (veja *_planeja*).
+        self.doadores = {}
+        for i, (_, sobras) in enumerate(self.estados):
+            if self.faltantes[i]:
+                for fig in sobras:
+                    self.doadores.setdefault(fig, {})[i] = None
+        # colecionadores com repetidas novas desde a última negociação, em ordem de inserção
+        self.alterados = {i: None for i, (_, sobras) in enumerate(self.estados) if sobras}
+
+
+
+    def insere_muitos(self, i: int, figs: list[int]) -> None:
+        '''
+        Insere as figurinhas de *figs* na coleção do colecionador *i* e no estado do mercado.
+        '''
+        self.colecoes[i].insere_muitos(figs)
+        possui, sobras = self.estados[i]
+        faltantes = self.faltantes[i]
+        completo = not faltantes
+        for fig in figs:
+            if fig in possui:
+                sobras[fig] = sobras.get(fig, 0) + 1
+                if faltantes:
+                    self.doadores.setdefault(fig, {})[i] = None
+                    self.alterados[i] = None
+            else:
+                possui.add(fig)
+                faltantes.discard(fig)
+        if not faltantes and not completo:
+            self.__retira_doador(i)
+
+
+
+    def negocia(self) -> list[Troca]:
+        '''
+        Planeja e realiza as trocas possíveis desde a última negociação, retornando-as. Para cada
+        colecionador alterado (em ordem de índice), as figurinhas que lhe faltam e têm doadores são
+        percorridas em ordem crescente, e cada uma é recebida do primeiro doador que não possua
+        alguma das repetidas do colecionador, como em *planeja_trocas*.
+        '''
+        trocas: list[Troca] = []
+        for a in sorted(self.alterados):
+            possui_a, sobras_a = self.estados[a]
+            faltantes_a = self.faltantes[a]
+            # set & percorre o menor dos dois conjuntos
+            candidatas = sorted(faltantes_a & self.doadores.keys())
+            incompativeis: set[int] = set()
+            for y in candidatas:
+                if not sobras_a or not faltantes_a:
+                    break
+                for b in self.doadores.get(y, ()):
+                    if b in incompativeis:
+                        continue
+                    x = _primeira_faltante(sobras_a, self.estados[b][0])
+                    if x is None:
+                        incompativeis.add(b)
+                        continue
+                    trocas.append(Troca(a, b, y, x))
+                    _transfere(self.estados, self.doadores, b, a, y)
+                    _transfere(self.estados, self.doadores, a, b, x)
+                    self.__recebida(a, y)
+                    self.__recebida(b, x)
+                    break
+        self.alterados.clear()
+        realiza_trocas(self.colecoes, trocas)
+        return trocas
+
+
+
+    def __recebida(self, i: int, fig: int) -> None:
+        '''
+        Retira *fig*, recebida em uma troca, das faltantes do colecionador *i*, que sai do índice
+        de doadores se fica completo.
+        '''
+        self.faltantes[i].discard(fig)
+        if not self.faltantes[i]:
+            self.__retira_doador(i)
+
+
+
+    def __retira_doador(self, i: int) -> None:
+        '''
+        Retira o colecionador *i* (completo) do índice de doadores.
+        '''
+        for fig in self.estados[i][1]:
+            doadores = self.doadores.get(fig)
+            if doadores is not None and i in doadores:
+                del doadores[i]
+                if not doadores:
+                    del self.doadores[fig]
+
+
+
+def _restringe(estados: list[Estado], inicio: int, fim: int) -> list[Estado]:
+    '''
+    Retorna os estados considerando apenas as figurinhas em [*inicio*, *fim*).
+    '''
+    return [({f for f in possui if inicio <= f < fim}, {f: q for f, q in sobras.items() if inicio <= f < fim})
+            for possui, sobras in estados]
+
+
+
+def _planeja(estados: list[Estado]) -> list[Troca]:
+    '''
+    Planejamento guloso de *planeja_trocas* sobre os estados dos colecionadores. Os estados são
+    atualizados conforme as trocas são escolhidas.
+    '''
+    # doadores[fig] contém (como chaves, em ordem de inserção) os colecionadores que ainda têm fig
+    # repetida; a figurinha sai do índice quando não tem mais doadores (veja *_transfere*).
+    doadores: dict[int, dict[int, None]] = {}
+    for i, (_, sobras) in enumerate(estados):
+        for fig in sobras:
+            doadores.setdefault(fig, {})[i] = None
+    disponiveis = sorted(doadores)
+    # salto[i] leva à próxima posição de disponiveis que ainda pode ter doadores (veja *_proxima*).
+    salto = list(range(len(disponiveis) + 1))
+
+    trocas: list[Troca] = []
+    for a, (possui_a, sobras_a) in enumerate(estados):
+        # Um doador que possui todas as repetidas de a continua assim durante a vez de a, pois as
+        # repetidas de a só diminuem e as figurinhas do doador só aumentam.
+        incompativeis: set[int] = set()
+        i = _proxima(salto, 0)
+        while sobras_a and i < len(disponiveis):
+            y = disponiveis[i]
+            if y not in doadores:
+                salto[i] = i + 1
+            elif y not in possui_a:
+                for b in doadores[y]:
+                    if b in incompativeis:
+                        continue
+                    x = _primeira_faltante(sobras_a, estados[b][0])
+                    if x is None:
+                        incompativeis.add(b)
+                        continue
+                    trocas.append(Troca(a, b, y, x))
+                    _transfere(estados, doadores, b, a, y)
+                    _transfere(estados, doadores, a, b, x)
+                    break
+            i = _proxima(salto, i + 1)
+    return trocas
+
+
+
+def _proxima(salto: list[int], i: int) -> int:
+    '''
+    Retorna a primeira posição a partir de *i* que não foi descartada em *salto*, encurtando
+    os caminhos percorridos (como em union-find) para que os descartes sejam pulados de uma vez.
+    '''
+    raiz = i
+    while salto[raiz] != raiz:
+        raiz = salto[raiz]
+    while salto[i] != raiz:
+        salto[i], i = raiz, salto[i]
+    return raiz
+
+
+
+def _primeira_faltante(sobras: dict[int, int], possui: set[int]) -> int | None:
+    '''
+    Retorna a primeira figurinha de *sobras* que não está em *possui*, ou None. Em *planeja_trocas*,
+    *sobras* é criado em ordem crescente e só perde chaves, de modo que essa é a menor delas; em
+    *Mercado*, as repetidas novas entram no fim.
+    '''
+    for fig in sobras:
+        if fig not in possui:
+            return fig
+    return None
+
+
+
+def _transfere(estados: list[Estado], doadores: dict[int, dict[int, None]], origem: int, destino: int, fig: int) -> None:
+    '''
+    Passa uma cópia repetida de *fig* do colecionador *origem* para *destino*, que não a possui.
+    '''
+    sobras = estados[origem][1]
+    if sobras[fig] == 1:
+        del sobras[fig]
+        del doadores[fig][origem]
+        if not doadores[fig]:
+            del doadores[fig]
+    else:
+        sobras[fig] -= 1
+    estados[destino][0].add(fig)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import random
+from colecao_tad import Colecao
+from mercado import Mercado
+
+
+@dataclass
+class ResultadoSimulacao:
+    '''
+    Resultado de uma simulação: quantos pacotes cada colecionador abriu até completar o álbum,
+    quantas trocas foram feitas e quantas rodadas foram necessárias.
+    '''
+    pacotes: list[int]
+    trocas: int
+    rodadas: int
+
+    def media_pacotes(self) -> float:
+        '''
+        Retorna a média de pacotes abertos por colecionador.
+
+        Exemplos:
+        >>> ResultadoSimulacao([10, 20], 0, 20).media_pacotes()
+        15.0
+        '''
+        return sum(self.pacotes) / len(self.pacotes)
+
+
+
+@dataclass
+class Estatisticas:
+    '''
+    Estatísticas de várias simulações independentes (Monte Carlo) com os mesmos parâmetros,
+    executadas com e sem trocas a partir das mesmas sementes.
+    '''
+    simulacoes: int
+    media_sem_troca: float
+    media_com_troca: float
+
+    def economia(self) -> float:
+        '''
+        Retorna a fração de pacotes economizada pelas trocas.
+
+        Exemplos:
+        >>> Estatisticas(10, 200.0, 150.0).economia()
+        0.25
+        '''
+        return 1 - self.media_com_troca / self.media_sem_troca
+
+
+
+def simula(tam_album: int, colecionadores: int = 1, tam_pacote: int = 5, trocas: bool = True,
+           semente: int = 0, pacotes_por_rodada: int = 1, backend: str = 'auto') -> ResultadoSimulacao:
+    '''
+    Simula *colecionadores* comprando pacotes de *tam_pacote* figurinhas aleatórias (uniformes)
+    de um álbum de *tam_album* figurinhas até que todos completem o álbum. A cada rodada, cada
+    colecionador incompleto abre *pacotes_por_rodada* pacotes e, se *trocas* é True, os
+    colecionadores trocam repetidas por um *Mercado*, que mantém seu estado entre as rodadas e só
+    procura trocas para quem ganhou repetidas na rodada (os completos não participam).
+
+    As figurinhas de uma rodada são sorteadas de uma só vez e inseridas em lote em cada coleção.
+    A quantidade de pacotes de cada colecionador é contada em múltiplos de *pacotes_por_rodada*.
+    O resultado depende apenas dos parâmetros (a *semente* fixa o sorteio).
+
+    Exemplos:
+    >>> simula(10, semente=3) == simula(10, semente=3)
+    True
+    >>> r = simula(50, colecionadores=4, semente=1)
+    >>> len(r.pacotes), min(r.pacotes) >= 10, r.trocas > 0
+    (4, True, True)
+    >>> simula(50, colecionadores=4, semente=1, trocas=False).trocas
+    0
+    '''
+    rnd = random.Random(semente)
+    figurinhas = range(1, tam_album + 1)
+    colecoes = [Colecao.create(tam_album, backend) for _ in range(colecionadores)]
+    mercado = Mercado(colecoes) if trocas and colecionadores > 1 else None
+    pacotes = [0] * colecionadores
+    total_trocas = 0
+    rodadas = 0
+    incompletos = list(range(colecionadores))
+    while incompletos:
+        rodadas += 1
+        por_colecionador = tam_pacote * pacotes_por_rodada
+        sorteio = rnd.choices(figurinhas, k=por_colecionador * len(incompletos))
+        for j, i in enumerate(incompletos):
+            pacote = sorteio[j * por_colecionador:(j + 1) * por_colecionador]
+            if mercado is None:
+                colecoes[i].insere_muitos(pacote)
+            else:
+                mercado.insere_muitos(i, pacote)
+            pacotes[i] += pacotes_por_rodada
+        if mercado is not None:
+            total_trocas += len(mercado.negocia())
+        incompletos = [i for i in incompletos if colecoes[i].faltantes() > 0]
+    return ResultadoSimulacao(pacotes, total_trocas, rodadas)
+
+
+
+def monte_carlo(tam_album: int, simulacoes: int, colecionadores: int = 1, tam_pacote: int = 5,
+                semente: int = 0, processos: int | None = None, pacotes_por_rodada: int = 1) -> Estatisticas:
+    '''
+    Executa *simulacoes* simulações independentes (veja *simula*), cada uma com e sem trocas a
+    partir da mesma semente, e retorna a média de pacotes por colecionador em cada caso. As
+    sementes das simulações são derivadas de *semente*, de modo que o resultado não depende de
+    *processos*: se não é None, as simulações são distribuídas entre esse número de processos.
+
+    Exemplos:
+    >>> e = monte_carlo(30, 6, colecionadores=3, semente=7)
+    >>> e == monte_carlo(30, 6, colecionadores=3, semente=7, processos=2)
+    True
+    >>> e.simulacoes, e.media_com_troca < e.media_sem_troca
+    (6, True)
+    '''
+    rnd = random.Random(semente)
+    tarefas = [(tam_album, colecionadores, tam_pacote, com_troca, s, pacotes_por_rodada)
+               for s in (rnd.getrandbits(64) for _ in range(simulacoes))
+               for com_troca in (False, True)]
+    if processos is None:
+        resultados = [_executa(t) for t in tarefas]
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            resultados = list(executor.map(_executa, tarefas, chunksize=max(1, len(tarefas) // (4 * processos))))
+
+    sem_troca = resultados[0::2]
+    com_troca = resultados[1::2]
+    return Estatisticas(simulacoes,
+                        sum(sem_troca) / simulacoes if simulacoes else 0.0,
+                        sum(com_troca) / simulacoes if simulacoes else 0.0)
+
+
+
+def _executa(tarefa: tuple[int, int, int, bool, int, int]) -> float:
+    '''
+    Executa uma simulação de *monte_carlo* e retorna a média de pacotes por colecionador.
+    '''
+    tam_album, colecionadores, tam_pacote, com_troca, semente, pacotes_por_rodada = tarefa
+    return simula(tam_album, colecionadores, tam_pacote, com_troca, semente, pacotes_por_rodada).media_pacotes()
@@ -1,13 +1,33 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from collections import deque
+from itertools import zip_longest
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
 
 #Algumas das funções foram utilizadas para a realização de exemplos. (como remove e insere)
+#As funções percorrem a Arvore com laços e pilhas explícitas (sem recursão), de modo que árvores
+#degeneradas com muitos nós não atingem o limite de recursão do Python.
+#Cada nó guarda a altura e a quantidade de nós da sua subárvore (fora da representação do nó),
+#atualizadas no caminho percorrido por insere e remove, de modo que altura e num_elem custam O(1).
 
 @dataclass
 class No:
     esq: Arvore
     val: int
     dir: Arvore
+    alt: int = field(default=0, repr=False) #altura da subárvore com raiz neste nó (uma folha tem altura 0)
+    tam: int = field(default=1, repr=False) #quantidade de nós da subárvore com raiz neste nó
+
+    def __post_init__(self) -> None:
+        '''
+        Calcula a altura e a quantidade de nós a partir dos filhos.
+
+        Exemplos:
+        >>> t = No(No(None, 1, No(None, 2, None)), 3, No(None, 5, No(None, 9, None)))
+        >>> t.alt, t.tam, t.esq.tam
+        (2, 5, 2)
+        '''
+        _atualiza(self)
 
 Arvore = No | None
 
@@ -37,24 +57,40 @@ def remove(t: Arvore, val: int) -> Arvore:
     No(esq=None, val=2, dir=No(esq=None, val=4, dir=No(esq=None, val=6, dir=None)))
     '''
 
-    if t is None:
-        return None
-    elif val > t.val:
-        t.dir = remove(t.dir, val)
+    caminho: list[No] = [] # nós acima do nó retirado, cujas alturas e tamanhos mudam
+    no = t
+    while no is not None and no.val != val:
+        caminho.append(no)
+        no = no.dir if val > no.val else no.esq
+    if no is None: # o valor não pertence à Arvore
         return t
-    elif val < t.val:
-        t.esq = remove(t.esq, val)
+
+    if no.esq is not None and no.dir is not None: # possui dois filhos
+        # o nó recebe o maior valor da subárvore esquerda, cujo nó (sem filho direito) é retirado
+        caminho.append(no)
+        m = no.esq
+        while m.dir is not None:
+            caminho.append(m)
+            m = m.dir
+        no.val = m.val
+        pai_m = caminho[-1]
+        if pai_m is no:
+            pai_m.esq = m.esq
+        else:
+            pai_m.dir = m.esq
+        _atualiza_caminho(caminho)
         return t
-    else: # val == t.val
-        if t.esq is None:
-            return t.dir
-        elif t.dir is None:
-            return t.esq
-        else: # possui dois filhos
-            m = maximo(t.esq)
-            t.val = m #type: ignore  #O mypy não consegue inferir que t.val é um int (caso seja None ele para anteriormente)
-            t.esq = remove(t.esq, m) #type: ignore
-            return t
+
+    filho = no.esq if no.esq is not None else no.dir
+    if not caminho:
+        return filho
+    pai = caminho[-1]
+    if pai.esq is no:
+        pai.esq = filho
+    else:
+        pai.dir = filho
+    _atualiza_caminho(caminho)
+    return t
 
 
 def insere(t: Arvore, val: int) -> No:
@@ -79,14 +115,24 @@ def insere(t: Arvore, val: int) -> No:
 
     if t is None:
         return No(None, val, None)
-    else:
-        if val > t.val:
-            t.dir = insere(t.dir, val)
-        elif val < t.val:
-            t.esq = insere(t.esq, val)
-        else: # t.val == val (o valor ja pertence à Arvore)
-            pass
-        return t
+    caminho: list[No] = [] # nós acima do nó inserido, cujas alturas e tamanhos mudam
+    no = t
+    while True:
+        caminho.append(no)
+        if val > no.val:
+            if no.dir is None:
+                no.dir = No(None, val, None)
+                break
+            no = no.dir
+        elif val < no.val:
+            if no.esq is None:
+                no.esq = No(None, val, None)
+                break
+            no = no.esq
+        else: # no.val == val (o valor ja pertence à Arvore)
+            return t
+    _atualiza_caminho(caminho)
+    return t
     
 
 def maximo(t:Arvore) -> int | None:
@@ -106,10 +152,9 @@ def maximo(t:Arvore) -> int | None:
 
     if t is None:
         return None
-    elif t.dir is None:
-        return t.val
-    else:
-        return maximo(t.dir)
+    while t.dir is not None:
+        t = t.dir
+    return t.val
     
 
 def busca(t: Arvore, val: int) -> bool:
@@ -128,19 +173,19 @@ def busca(t: Arvore, val: int) -> bool:
     False
     '''
 
-    if t is None:
-        return False
-    elif val > t.val:
-        return busca(t.dir, val)
-    elif val < t.val:
-        return busca(t.esq, val)
-    else: #val == t.val
-        return True
+    while t is not None:
+        if val > t.val:
+            t = t.dir
+        elif val < t.val:
+            t = t.esq
+        else: #val == t.val
+            return True
+    return False
     
 
 def num_elem(t: Arvore) -> int:
     '''
-    Retorna a quantidade de elementos pertencentes à Arvore.
+    Retorna a quantidade de elementos pertencentes à Arvore (armazenada em cada nó, custo O(1)).
 
     Exemplos:
     >>> t = None
@@ -150,12 +195,16 @@ def num_elem(t: Arvore) -> int:
     ...     t = insere(t, i)
     >>> num_elem(t)
     9
+    >>> for i in range(10, 3001):
+    ...     t = insere(t, i)
+    >>> num_elem(t)
+    3000
     '''
 
     if t is None:
         return 0
     else:
-        return 1 + num_elem(t.esq) + num_elem(t.dir)
+        return t.tam
     
 
 def balanceada(t: Arvore) -> True:
@@ -183,23 +232,80 @@ def balanceada(t: Arvore) -> True:
     False
     '''
 
-    return t is None or abs(altura(t.esq) - altura(t.dir)) <= 1 and balanceada(t.esq) and balanceada(t.dir)
+    return all(abs(altura(no.esq) - altura(no.dir)) <= 1 for no in _nos(t))
     
 
 def altura(t: Arvore) -> int:
     '''
-    Retorna a altura da Arvore.
+    Retorna a altura da Arvore (armazenada em cada nó, custo O(1)).
 
     Exemplos:
     >>> t: Arvore = No(No(No(None, 3, No(None, 4, None)),8, None), 2, No(No(None, 7, None), 3, No(No(None, 2, None), 5, None)))
     >>> altura(t)
     3
+    >>> t = None
+    >>> for i in range(3000):
+    ...     t = insere(t, i)
+    >>> altura(t)
+    2999
     '''
 
     if t is None:
         return -1
     else:
-        return 1 + max(altura(t.esq), altura(t.dir))
+        return t.alt
+
+
+def k_esimo(t: Arvore, k: int) -> int | None:
+    '''
+    Retorna o *k*-ésimo menor elemento da Arvore (k = 1 é o menor), ou None se a Arvore tem menos
+    de *k* elementos. Usa a quantidade de nós guardada em cada subárvore, com custo O(altura(t)).
+
+    Exemplos:
+    >>> t = None
+    >>> for i in [50, 10, 40, 20, 30]:
+    ...     t = insere(t, i)
+    >>> [k_esimo(t, k) for k in range(0, 7)]
+    [None, 10, 20, 30, 40, 50, None]
+    >>> k_esimo(remove(t, 10), 1)
+    20
+    '''
+
+    if k < 1 or k > num_elem(t):
+        return None
+    while t is not None:
+        menores = num_elem(t.esq)
+        if k <= menores:
+            t = t.esq
+        elif k == menores + 1:
+            return t.val
+        else:
+            k -= menores + 1
+            t = t.dir
+    return None
+
+
+def posicao(t: Arvore, val: int) -> int:
+    '''
+    Retorna quantos elementos da Arvore são menores que *val* (a posição de *val*, a partir de 0, na
+    sequência ordenada dos elementos, se ele pertence à Arvore). O custo é O(altura(t)).
+
+    Exemplos:
+    >>> t = array_arvore([10, 20, 30, 40, 50])
+    >>> posicao(t, 10), posicao(t, 35), posicao(t, 50), posicao(t, 99)
+    (0, 3, 4, 5)
+    >>> all(k_esimo(t, posicao(t, v) + 1) == v for v in [10, 20, 30, 40, 50])
+    True
+    '''
+
+    menores = 0
+    while t is not None:
+        if val > t.val:
+            menores += num_elem(t.esq) + 1
+            t = t.dir
+        else:
+            t = t.esq
+    return menores
     
 
 def caminhos(t: Arvore) -> list[list[int]]:
@@ -215,12 +321,27 @@ def caminhos(t: Arvore) -> list[list[int]]:
     [[2, 8, 3, 4], [2, 3, 7], [2, 3, 5, 2]]
     '''
 
-    if t is None:
-        return []
-    elif t.esq is None and t.dir is None:
-        return [[t.val]]
-    else:
-        return [[t.val] + cam for cam in caminhos(t.esq)] + [[t.val] + cam for cam in caminhos(t.dir)]
+    return list(itera_caminhos(t))
+
+
+def itera_caminhos(t: Arvore) -> Iterator[list[int]]:
+    '''
+    Gera, sob demanda e na mesma ordem de *caminhos*, os caminhos da Arvore (raíz até folha).
+    Os caminhos são montados em uma única pilha compartilhada (sem copiar os prefixos a cada nível);
+    apenas o caminho gerado é copiado, de modo que o custo é O(n + tamanho da saída) e a memória
+    de trabalho é O(altura(t)).
+
+    Exemplos:
+    >>> t: Arvore = No(No(No(None, 3, No(None, 4, None)),8, None), 2, No(No(None, 7, None), 3, No(No(None, 2, None), 5, None)))
+    >>> it = itera_caminhos(t)
+    >>> next(it)
+    [2, 8, 3, 4]
+    >>> list(it)
+    [[2, 3, 7], [2, 3, 5, 2]]
+    '''
+
+    for caminho in _percorre_caminhos(t):
+        yield list(caminho)
     
 
 def busca_arvore(t1: Arvore, t2: Arvore) -> bool:
@@ -242,10 +363,7 @@ def busca_arvore(t1: Arvore, t2: Arvore) -> bool:
     False
     '''
 
-    if t1 is None:
-        return True
-    else:
-        return busca(t2, t1.val) and busca_arvore(t1.esq, t2) and busca_arvore(t1.dir, t2)
+    return subconjunto(t1, t2)
 
 
 
@@ -288,10 +406,7 @@ def array_arvore(arr: list[int]) -> Arvore:
     ...         raise ValueError("A árvore não está balanceada")
     '''
 
-    if arr == []:
-        return None
-    else:
-        return No(array_arvore(arr[:len(arr)//2]), arr[len(arr)//2], array_arvore(arr[len(arr)//2+1:]))
+    return _constroi(arr, 0, len(arr))
     
 
 def elem_iguais(t1: Arvore, t2: Arvore) -> bool:
@@ -361,7 +476,7 @@ def elem_iguais(t1: Arvore, t2: Arvore) -> bool:
     False
     '''
 
-    return num_elem(t1) == num_elem(t2) and busca_arvore(t1, t2)
+    return iguais(t1, t2)
 
 
 def caminhos_maximos(t: Arvore) -> list[list[int]]:
@@ -391,9 +506,358 @@ def caminhos_maximos(t: Arvore) -> list[list[int]]:
     [[2, 3, 5], [2, 7, 8]]
     '''
 
-    cam_final = []
-    if altura(t) >= 0:
-        for i in caminhos(t):
-            if len(i) == altura(t) + 1:
-                cam_final.append(i)
+    # Uma única busca em profundidade: guarda os caminhos de maior tamanho vistos até agora,
+    # descartando-os quando uma folha mais profunda é encontrada.
+    cam_final: list[list[int]] = []
+    maior = 0
+    for caminho in _percorre_caminhos(t):
+        if len(caminho) > maior:
+            maior = len(caminho)
+            cam_final = []
+        if len(caminho) == maior:
+            cam_final.append(list(caminho))
     return cam_final
+
+
+def em_ordem(t: Arvore) -> Iterator[int]:
+    '''
+    Gera os valores da Arvore em ordem (crescente), sob demanda, usando uma pilha com no máximo
+    altura(t) + 1 nós.
+
+    Exemplos:
+    >>> t = array_arvore([1, 2, 3, 4, 5, 6])
+    >>> list(em_ordem(t))
+    [1, 2, 3, 4, 5, 6]
+    >>> list(em_ordem(None))
+    []
+    '''
+
+    pilha: list[No] = []
+    no = t
+    while pilha or no is not None:
+        while no is not None:
+            pilha.append(no)
+            no = no.esq
+        no = pilha.pop()
+        yield no.val
+        no = no.dir
+
+
+def pre_ordem(t: Arvore) -> Iterator[int]:
+    '''
+    Gera os valores da Arvore em pré-ordem (raiz, subárvore esquerda, subárvore direita), sob demanda.
+
+    Exemplos:
+    >>> t = array_arvore([1, 2, 3, 4, 5, 6])
+    >>> list(pre_ordem(t))
+    [4, 2, 1, 3, 6, 5]
+    '''
+
+    for no in _nos(t):
+        yield no.val
+
+
+def em_nivel(t: Arvore) -> Iterator[int]:
+    '''
+    Gera os valores da Arvore por nível (da raiz para as folhas, da esquerda para a direita), sob demanda.
+
+    Exemplos:
+    >>> t = array_arvore([1, 2, 3, 4, 5, 6])
+    >>> list(em_nivel(t))
+    [4, 2, 6, 1, 3, 5]
+    '''
+
+    fila = deque([t] if t is not None else [])
+    while fila:
+        no = fila.popleft()
+        yield no.val
+        if no.esq is not None:
+            fila.append(no.esq)
+        if no.dir is not None:
+            fila.append(no.dir)
+
+
+def subconjunto(t1: Arvore, t2: Arvore) -> bool:
+    '''
+    Retorna True se todos os elementos de t1 estão contidos em t2. As duas Arvores são percorridas
+    em ordem simultaneamente (como em uma intercalação), com custo O(n + m) e memória O(h), parando
+    na primeira diferença encontrada.
+
+    Exemplos:
+    >>> t1 = array_arvore([2, 4, 6])
+    >>> subconjunto(t1, array_arvore([1, 2, 3, 4, 5, 6]))
+    True
+    >>> subconjunto(t1, array_arvore([2, 4, 5, 7]))
+    False
+    >>> subconjunto(None, t1), subconjunto(t1, None)
+    (True, False)
+    '''
+
+    it2 = em_ordem(t2)
+    for val in em_ordem(t1):
+        for outro in it2:
+            if outro >= val:
+                break
+        else: # t2 terminou antes de val
+            return False
+        if outro != val:
+            return False
+    return True
+
+
+def iguais(t1: Arvore, t2: Arvore) -> bool:
+    '''
+    Retorna True se as duas Arvores possuem os mesmos elementos, comparando-as em ordem
+    simultaneamente (custo O(n + m), parando na primeira diferença).
+
+    Exemplos:
+    >>> t1 = array_arvore([1, 2, 3])
+    >>> t2 = insere(insere(insere(None, 1), 2), 3)
+    >>> iguais(t1, t2), iguais(t1, remove(t2, 3)), iguais(None, None)
+    (True, False, True)
+    '''
+
+    fim = object()
+    return all(a == b for a, b in zip_longest(em_ordem(t1), em_ordem(t2), fillvalue=fim))
+
+
+def itera_intersecao(t1: Arvore, t2: Arvore) -> Iterator[int]:
+    '''
+    Gera, em ordem crescente, os elementos que estão em t1 e em t2, percorrendo as duas Arvores
+    em ordem simultaneamente.
+
+    Exemplos:
+    >>> list(itera_intersecao(array_arvore([1, 3, 5, 7]), array_arvore([3, 4, 5, 8])))
+    [3, 5]
+    '''
+
+    it1 = em_ordem(t1)
+    it2 = em_ordem(t2)
+    a = next(it1, None)
+    b = next(it2, None)
+    while a is not None and b is not None:
+        if a < b:
+            a = next(it1, None)
+        elif b < a:
+            b = next(it2, None)
+        else:
+            yield a
+            a = next(it1, None)
+            b = next(it2, None)
+
+
+def itera_diferenca(t1: Arvore, t2: Arvore) -> Iterator[int]:
+    '''
+    Gera, em ordem crescente, os elementos de t1 que não estão em t2, percorrendo as duas Arvores
+    em ordem simultaneamente.
+
+    Exemplos:
+    >>> list(itera_diferenca(array_arvore([1, 3, 5, 7]), array_arvore([3, 4, 5, 8])))
+    [1, 7]
+    '''
+
+    it2 = em_ordem(t2)
+    b = next(it2, None)
+    for a in em_ordem(t1):
+        while b is not None and b < a:
+            b = next(it2, None)
+        if b != a:
+            yield a
+
+
+def intersecao(t1: Arvore, t2: Arvore) -> Arvore:
+    '''
+    Retorna uma Arvore balanceada com os elementos que estão em t1 e em t2 (veja *itera_intersecao*).
+
+    Exemplos:
+    >>> intersecao(array_arvore([1, 3, 5, 7]), array_arvore([3, 4, 5, 8]))
+    No(esq=No(esq=None, val=3, dir=None), val=5, dir=None)
+    '''
+
+    return array_arvore(list(itera_intersecao(t1, t2)))
+
+
+def diferenca(t1: Arvore, t2: Arvore) -> Arvore:
+    '''
+    Retorna uma Arvore balanceada com os elementos de t1 que não estão em t2 (veja *itera_diferenca*).
+
+    Exemplos:
+    >>> list(em_ordem(diferenca(array_arvore([1, 3, 5, 7]), array_arvore([3, 4, 5, 8]))))
+    [1, 7]
+    '''
+
+    return array_arvore(list(itera_diferenca(t1, t2)))
+
+
+def ordena_valores(valores: Iterable[int]) -> list[int]:
+    '''
+    Retorna a lista dos *valores* em ordem crescente e sem repetições. Se os valores já estão
+    em ordem estritamente crescente (verificado em O(n)), a lista não é reordenada.
+
+    Exemplos:
+    >>> ordena_valores(range(5))
+    [0, 1, 2, 3, 4]
+    >>> ordena_valores([3, 1, 3, 2])
+    [1, 2, 3]
+    '''
+
+    arr = list(valores)
+    if any(arr[i] >= arr[i + 1] for i in range(len(arr) - 1)):
+        arr = sorted(set(arr))
+    return arr
+
+
+def constroi(valores: Iterable[int]) -> Arvore:
+    '''
+    Constrói uma Arvore balanceada com os *valores* (em qualquer ordem, com ou sem repetições),
+    em tempo O(n) se os valores já estão ordenados e O(n log n) caso contrário.
+
+    Exemplos:
+    >>> constroi([5, 1, 3, 1])
+    No(esq=No(esq=None, val=1, dir=None), val=3, dir=No(esq=None, val=5, dir=None))
+    >>> t = constroi(range(100_000))
+    >>> num_elem(t), altura(t), balanceada(t)
+    (100000, 16, True)
+    '''
+
+    return array_arvore(ordena_valores(valores))
+
+
+def divide(t: Arvore, k: int) -> tuple[Arvore, Arvore]:
+    '''
+    Divide a Arvore em duas: uma com os elementos menores que *k* e outra com os maiores ou iguais
+    a *k*. Os nós de *t* são reaproveitados (*t* deixa de ser válida) e o custo é O(altura(t)).
+
+    Exemplos:
+    >>> menores, maiores = divide(constroi(range(1, 8)), 3)
+    >>> list(em_ordem(menores)), list(em_ordem(maiores))
+    ([1, 2], [3, 4, 5, 6, 7])
+    >>> divide(None, 3)
+    (None, None)
+    '''
+
+    menores: Arvore = None
+    maiores: Arvore = None
+    ultimo_menor: No | None = None # nó da Arvore dos menores que recebe o próximo à direita
+    ultimo_maior: No | None = None # nó da Arvore dos maiores que recebe o próximo à esquerda
+    caminho: list[No] = [] # nós percorridos, cujas subárvores mudam
+    no = t
+    while no is not None:
+        caminho.append(no)
+        if no.val < k:
+            if ultimo_menor is None:
+                menores = no
+            else:
+                ultimo_menor.dir = no
+            ultimo_menor = no
+            no = no.dir
+        else:
+            if ultimo_maior is None:
+                maiores = no
+            else:
+                ultimo_maior.esq = no
+            ultimo_maior = no
+            no = no.esq
+    if ultimo_menor is not None:
+        ultimo_menor.dir = None
+    if ultimo_maior is not None:
+        ultimo_maior.esq = None
+    _atualiza_caminho(caminho)
+    return menores, maiores
+
+
+def junta(t1: Arvore, t2: Arvore) -> Arvore:
+    '''
+    Junta duas Arvores em que todos os elementos de t1 são menores que os de t2. O nó do maior
+    elemento de t1 passa a ser a raiz, com o restante de t1 à esquerda e t2 à direita. Os nós são
+    reaproveitados e o custo é O(altura(t1)).
+
+    Exemplos:
+    >>> t = junta(constroi([1, 2, 3]), constroi([7, 8]))
+    >>> t
+    No(esq=No(esq=No(esq=None, val=1, dir=None), val=2, dir=None), val=3, dir=No(esq=No(esq=None, val=7, dir=None), val=8, dir=None))
+    >>> junta(None, t) is t
+    True
+    >>> num_elem(t), altura(t)
+    (5, 2)
+    '''
+
+    if t1 is None:
+        return t2
+    caminho: list[No] = [] # borda direita de t1 acima do maior elemento
+    m = t1
+    while m.dir is not None:
+        caminho.append(m)
+        m = m.dir
+    if caminho:
+        caminho[-1].dir = m.esq
+        _atualiza_caminho(caminho)
+        m.esq = t1
+    m.dir = t2
+    _atualiza(m)
+    return m
+
+
+def _constroi(arr: list[int], ini: int, fim: int) -> Arvore:
+    '''
+    Constrói a Arvore balanceada com os elementos arr[ini:fim] (ordenados), sem copiar a lista.
+    '''
+
+    if ini >= fim:
+        return None
+    meio = ini + (fim - ini) // 2
+    return No(_constroi(arr, ini, meio), arr[meio], _constroi(arr, meio + 1, fim))
+
+
+def _atualiza(t: No) -> None:
+    '''
+    Recalcula a altura e a quantidade de nós de *t* a partir das de seus filhos.
+    '''
+
+    t.alt = 1 + max(altura(t.esq), altura(t.dir))
+    t.tam = 1 + num_elem(t.esq) + num_elem(t.dir)
+
+
+def _atualiza_caminho(caminho: list[No]) -> None:
+    '''
+    Recalcula a altura e a quantidade de nós dos nós de *caminho*, em que cada nó é ancestral dos
+    seguintes, do último (mais profundo) para o primeiro.
+    '''
+
+    for no in reversed(caminho):
+        _atualiza(no)
+
+
+def _percorre_caminhos(t: Arvore) -> Iterator[list[int]]:
+    '''
+    Gera, a cada folha, o caminho da raiz até ela, em uma pilha compartilhada que é alterada
+    depois de cada passo (quem precisa guardar o caminho deve copiá-lo).
+    '''
+
+    caminho: list[int] = []
+    pilha = [(t, 0)] if t is not None else []
+    while pilha:
+        no, prof = pilha.pop()
+        del caminho[prof:]
+        caminho.append(no.val)
+        if no.esq is None and no.dir is None:
+            yield caminho
+        if no.dir is not None:
+            pilha.append((no.dir, prof + 1))
+        if no.esq is not None:
+            pilha.append((no.esq, prof + 1))
+
+
+def _nos(t: Arvore) -> Iterator[No]:
+    '''
+    Gera os nós da Arvore em pré-ordem, usando uma pilha explícita.
+    '''
+
+    pilha = [t] if t is not None else []
+    while pilha:
+        no = pilha.pop()
+        yield no
+        if no.dir is not None:
+            pilha.append(no.dir)
+        if no.esq is not None:
+            pilha.append(no.esq)
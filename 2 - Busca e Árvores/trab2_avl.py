@@ -0,0 +1,410 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Iterable
+from trab2_arvores import balanceada, caminhos, busca_arvore, elem_iguais, caminhos_maximos
+from trab2_arvores import em_ordem, pre_ordem, em_nivel, subconjunto, iguais, itera_intersecao, itera_diferenca
+from trab2_arvores import ordena_valores, itera_caminhos
+
+#Variante AVL de trab2_arvores: as funções têm os mesmos nomes e contratos, de modo que basta trocar
+#o import (from trab2_avl import ...) para usar árvores que se mantêm balanceadas.
+
+@dataclass
+class No:
+    esq: Arvore
+    val: int
+    dir: Arvore
+    alt: int = field(default=0, repr=False) #altura da subárvore com raiz neste nó (uma folha tem altura 0)
+    tam: int = field(default=1, repr=False) #quantidade de nós da subárvore com raiz neste nó
+
+    def __post_init__(self) -> None:
+        '''
+        Calcula a altura e a quantidade de nós a partir dos filhos, de modo que uma Arvore
+        montada diretamente com No também tem esses campos corretos.
+
+        Exemplos:
+        >>> t = No(No(None, 1, No(None, 2, None)), 3, No(None, 5, No(None, 9, None)))
+        >>> altura(t), num_elem(t), k_esimo(t, 4)
+        (2, 5, 5)
+        '''
+        _atualiza(self)
+
+Arvore = No | None
+
+
+def remove(t: Arvore, val: int) -> Arvore:
+    '''
+    Remove um elemento da Arvore, caso esse elemento não pertença, nada acontece.
+    A Arvore é rebalanceada no caminho de volta até a raiz, de modo que o custo é O(log n).
+
+    Exemplos:
+    >>> t = None
+    >>> t = remove(t, 3)
+    >>> t
+    >>> for i in range(1, 8):
+    ...     t = insere(t, i)
+    >>> t = remove(t, 4)
+    >>> t
+    No(esq=No(esq=No(esq=None, val=1, dir=None), val=2, dir=None), val=3, dir=No(esq=No(esq=None, val=5, dir=None), val=6, dir=No(esq=None, val=7, dir=None)))
+    >>> t = remove(t, 3)
+    >>> t = remove(t, 1)
+    >>> t
+    No(esq=No(esq=None, val=2, dir=No(esq=None, val=5, dir=None)), val=6, dir=No(esq=None, val=7, dir=None))
+    >>> t = remove(t, 2)
+    >>> t
+    No(esq=No(esq=None, val=5, dir=None), val=6, dir=No(esq=None, val=7, dir=None))
+    '''
+
+    if t is None:
+        return None
+    elif val > t.val:
+        t.dir = remove(t.dir, val)
+    elif val < t.val:
+        t.esq = remove(t.esq, val)
+    else: # val == t.val
+        if t.esq is None:
+            return t.dir
+        elif t.dir is None:
+            return t.esq
+        else: # possui dois filhos
+            m = maximo(t.esq)
+            t.val = m #type: ignore
+            t.esq = remove(t.esq, m) #type: ignore
+    return _rebalanceia(t)
+
+
+def insere(t: Arvore, val: int) -> No:
+    '''
+    Insere um elemento na Arvore, caso o elemento já pertença, não faz nada.
+    A Arvore é rebalanceada no caminho de volta até a raiz, de modo que o custo é O(log n)
+    mesmo quando os elementos são inseridos em ordem.
+
+    Exemplos:
+    >>> t = None
+    >>> t = insere(t, 1)
+    >>> t = insere(t, 2)
+    >>> t = insere(t, 3)
+    >>> t
+    No(esq=No(esq=None, val=1, dir=None), val=2, dir=No(esq=None, val=3, dir=None))
+    >>> t = insere(t, 2)
+    >>> num_elem(t)
+    3
+    >>> t = None
+    >>> for i in range(1, 100_001):
+    ...     t = insere(t, i)
+    >>> altura(t), balanceada(t), busca(t, 77_777)
+    (16, True, True)
+    '''
+
+    if t is None:
+        return No(None, val, None)
+    elif val > t.val:
+        t.dir = insere(t.dir, val)
+    elif val < t.val:
+        t.esq = insere(t.esq, val)
+    else: # t.val == val (o valor ja pertence à Arvore)
+        return t
+    return _rebalanceia(t)
+
+
+def maximo(t: Arvore) -> int | None:
+    '''
+    Retorna o valor do maior item pertencente à Arvore. Retorna None caso a Arvore seja vazia.
+
+    Exemplos:
+    >>> t = None
+    >>> maximo(t)
+    >>> for i in [5, 9, 1]:
+    ...     t = insere(t, i)
+    >>> maximo(t)
+    9
+    '''
+
+    if t is None:
+        return None
+    while t.dir is not None:
+        t = t.dir
+    return t.val
+
+
+def busca(t: Arvore, val: int) -> bool:
+    '''
+    Busca na Arvore o elemento *val*, retorna true caso o elemento pertença à ela e False caso contrário.
+
+    Exemplos:
+    >>> t = None
+    >>> for i in [3, 1, 5, 2, 9]:
+    ...     t = insere(t, i)
+    >>> busca(t, 9), busca(t, 2), busca(t, 10)
+    (True, True, False)
+    '''
+
+    while t is not None:
+        if val > t.val:
+            t = t.dir
+        elif val < t.val:
+            t = t.esq
+        else: #val == t.val
+            return True
+    return False
+
+
+def altura(t: Arvore) -> int:
+    '''
+    Retorna a altura da Arvore (armazenada em cada nó, custo O(1)).
+
+    Exemplos:
+    >>> altura(None)
+    -1
+    >>> altura(array_arvore([1, 2, 3, 4, 5, 6]))
+    2
+    '''
+
+    if t is None:
+        return -1
+    else:
+        return t.alt
+
+
+def array_arvore(arr: list[int]) -> Arvore:
+    '''
+    Recebe uma lista ordenada de inteiros e retorna uma Arvore AVL contendo esses inteiros
+    (com a mesma forma de trab2_arvores.array_arvore).
+
+    Exemplos:
+    >>> array_arvore([])
+    >>> array_arvore([1, 2, 3])
+    No(esq=No(esq=None, val=1, dir=None), val=2, dir=No(esq=None, val=3, dir=None))
+    >>> t = array_arvore(list(range(10)))
+    >>> t = insere(t, 10)
+    >>> balanceada(t), altura(t)
+    (True, 3)
+    '''
+
+    return _constroi(arr, 0, len(arr))
+
+
+def num_elem(t: Arvore) -> int:
+    '''
+    Retorna a quantidade de elementos pertencentes à Arvore (armazenada em cada nó, custo O(1)).
+
+    Exemplos:
+    >>> t = None
+    >>> num_elem(t)
+    0
+    >>> for i in range(1, 10):
+    ...     t = insere(t, i)
+    >>> t = remove(t, 4)
+    >>> num_elem(t)
+    8
+    '''
+
+    if t is None:
+        return 0
+    else:
+        return t.tam
+
+
+def k_esimo(t: Arvore, k: int) -> int | None:
+    '''
+    Retorna o *k*-ésimo menor elemento da Arvore (k = 1 é o menor), ou None se a Arvore tem menos
+    de *k* elementos. O custo é O(log n), usando a quantidade de nós guardada em cada subárvore.
+
+    Exemplos:
+    >>> t = None
+    >>> for i in [50, 10, 40, 20, 30]:
+    ...     t = insere(t, i)
+    >>> [k_esimo(t, k) for k in range(0, 7)]
+    [None, 10, 20, 30, 40, 50, None]
+    '''
+
+    if k < 1 or k > num_elem(t):
+        return None
+    while t is not None:
+        menores = num_elem(t.esq)
+        if k <= menores:
+            t = t.esq
+        elif k == menores + 1:
+            return t.val
+        else:
+            k -= menores + 1
+            t = t.dir
+    return None
+
+
+def posicao(t: Arvore, val: int) -> int:
+    '''
+    Retorna quantos elementos da Arvore são menores que *val* (a posição de *val*, a partir de 0, na
+    sequência ordenada dos elementos, se ele pertence à Arvore). O custo é O(log n).
+
+    Exemplos:
+    >>> t = None
+    >>> for i in [50, 10, 40, 20, 30]:
+    ...     t = insere(t, i)
+    >>> posicao(t, 10), posicao(t, 35), posicao(t, 50), posicao(t, 99)
+    (0, 3, 4, 5)
+    >>> all(k_esimo(t, posicao(t, v) + 1) == v for v in [10, 20, 30, 40, 50])
+    True
+    '''
+
+    menores = 0
+    while t is not None:
+        if val > t.val:
+            menores += num_elem(t.esq) + 1
+            t = t.dir
+        else:
+            t = t.esq
+    return menores
+
+
+def intersecao(t1: Arvore, t2: Arvore) -> Arvore:
+    '''
+    Retorna uma Arvore AVL com os elementos que estão em t1 e em t2, em tempo O(n + m).
+
+    Exemplos:
+    >>> t = intersecao(array_arvore([1, 3, 5, 7]), array_arvore([3, 4, 5, 8]))
+    >>> list(em_ordem(t)), altura(t)
+    ([3, 5], 1)
+    '''
+
+    return array_arvore(list(itera_intersecao(t1, t2)))
+
+
+def diferenca(t1: Arvore, t2: Arvore) -> Arvore:
+    '''
+    Retorna uma Arvore AVL com os elementos de t1 que não estão em t2, em tempo O(n + m).
+
+    Exemplos:
+    >>> list(em_ordem(diferenca(array_arvore([1, 3, 5, 7]), array_arvore([3, 4, 5, 8]))))
+    [1, 7]
+    '''
+
+    return array_arvore(list(itera_diferenca(t1, t2)))
+
+
+def constroi(valores: Iterable[int]) -> Arvore:
+    '''
+    Constrói uma Arvore AVL com os *valores* (em qualquer ordem, com ou sem repetições), em tempo
+    O(n) se os valores já estão ordenados.
+
+    Exemplos:
+    >>> t = constroi([5, 1, 3, 1, 9])
+    >>> list(em_ordem(t)), num_elem(t), altura(t)
+    ([1, 3, 5, 9], 4, 2)
+    '''
+
+    return array_arvore(ordena_valores(valores))
+
+
+def divide(t: Arvore, k: int) -> tuple[Arvore, Arvore]:
+    '''
+    Divide a Arvore em duas Arvores AVL: uma com os elementos menores que *k* e outra com os
+    maiores ou iguais a *k*, em tempo O(log n). *t* deixa de ser válida.
+
+    Exemplos:
+    >>> menores, maiores = divide(constroi(range(1, 100)), 40)
+    >>> num_elem(menores), k_esimo(maiores, 1), balanceada(menores), balanceada(maiores)
+    (39, 40, True, True)
+    '''
+
+    if t is None:
+        return None, None
+    elif k <= t.val:
+        menores, maiores = divide(t.esq, k)
+        return menores, _junta_com(maiores, t.val, t.dir)
+    else:
+        menores, maiores = divide(t.dir, k)
+        return _junta_com(t.esq, t.val, menores), maiores
+
+
+def junta(t1: Arvore, t2: Arvore) -> Arvore:
+    '''
+    Junta duas Arvores AVL em que todos os elementos de t1 são menores que os de t2, em tempo
+    O(log n). A Arvore resultante é AVL.
+
+    Exemplos:
+    >>> t = junta(constroi(range(1, 4)), constroi(range(10, 100)))
+    >>> num_elem(t), balanceada(t), k_esimo(t, 4)
+    (93, True, 10)
+    >>> junta(None, None)
+    '''
+
+    if t1 is None:
+        return t2
+    m: int = maximo(t1) #type: ignore
+    return _junta_com(remove(t1, m), m, t2)
+
+
+def _constroi(arr: list[int], ini: int, fim: int) -> Arvore:
+    '''
+    Constrói a Arvore AVL com os elementos arr[ini:fim] (ordenados), sem copiar a lista.
+    '''
+    if ini >= fim:
+        return None
+    meio = ini + (fim - ini) // 2
+    return No(_constroi(arr, ini, meio), arr[meio], _constroi(arr, meio + 1, fim))
+
+
+def _junta_com(t1: Arvore, val: int, t2: Arvore) -> No:
+    '''
+    Junta as Arvores AVL t1 e t2 com o elemento *val* entre elas (t1 < val < t2). Desce pela
+    borda da Arvore mais alta até uma subárvore de altura próxima à da outra e rebalanceia na
+    volta, com custo O(|altura(t1) - altura(t2)| + 1).
+    '''
+    if altura(t1) > altura(t2) + 1:
+        t1.dir = _junta_com(t1.dir, val, t2) #type: ignore
+        return _rebalanceia(t1) #type: ignore
+    elif altura(t2) > altura(t1) + 1:
+        t2.esq = _junta_com(t1, val, t2.esq) #type: ignore
+        return _rebalanceia(t2) #type: ignore
+    else:
+        return No(t1, val, t2)
+
+
+def _atualiza(t: No) -> None:
+    '''
+    Recalcula a altura e a quantidade de nós de *t* a partir das de seus filhos.
+    '''
+    t.alt = 1 + max(altura(t.esq), altura(t.dir))
+    t.tam = 1 + num_elem(t.esq) + num_elem(t.dir)
+
+
+def _rotaciona_dir(t: No) -> No:
+    '''
+    Rotação simples à direita: o filho esquerdo de *t* passa a ser a raiz.
+    '''
+    e: No = t.esq #type: ignore
+    t.esq = e.dir
+    _atualiza(t)
+    e.dir = t
+    _atualiza(e)
+    return e
+
+
+def _rotaciona_esq(t: No) -> No:
+    '''
+    Rotação simples à esquerda: o filho direito de *t* passa a ser a raiz.
+    '''
+    d: No = t.dir #type: ignore
+    t.dir = d.esq
+    _atualiza(t)
+    d.esq = t
+    _atualiza(d)
+    return d
+
+
+def _rebalanceia(t: No) -> No:
+    '''
+    Atualiza a altura de *t*, cujas subárvores são AVL e diferem em altura no máximo 2, e
+    aplica as rotações necessárias. Retorna a nova raiz da subárvore.
+    '''
+    _atualiza(t)
+    fator = altura(t.esq) - altura(t.dir)
+    if fator > 1:
+        if altura(t.esq.esq) < altura(t.esq.dir): #type: ignore
+            t.esq = _rotaciona_esq(t.esq) #type: ignore
+        return _rotaciona_dir(t)
+    elif fator < -1:
+        if altura(t.dir.dir) < altura(t.dir.esq): #type: ignore
+            t.dir = _rotaciona_dir(t.dir) #type: ignore
+        return _rotaciona_esq(t)
+    return t